@@ -1,30 +1,18 @@
 from __future__ import annotations
 
+import importlib
 import os
+import pkgutil
 from logging.config import fileConfig
 import sys, pathlib
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
 
 
 from alembic import context
-from sqlalchemy import engine_from_config, pool
+from alembic.script import ScriptDirectory
+from sqlalchemy import engine_from_config, inspect, pool
 from dotenv import load_dotenv
 
-from api.models.base import Base  # noqa: F401
-from api.models import (
-    documents,
-    events,
-    login_tokens,
-    memberships,
-    org_metrics,
-    orgs,
-    permits,
-    requirements,
-    training_certs,
-    user_sessions,
-    users,
-)  # noqa: F401
-
 load_dotenv()
 
 config = context.config
@@ -35,10 +23,71 @@ DATABASE_URL = os.getenv("DATABASE_URL", config.get_main_option("sqlalchemy.url"
 config.set_main_option("sqlalchemy.url", DATABASE_URL)
 
 
+def _load_metadata():
+    """Import every module under api.models so Base.metadata is fully populated."""
+    import api.models
+    from api.models.base import Base
+
+    for module in pkgutil.iter_modules(api.models.__path__):
+        name = f"{api.models.__name__}.{module.name}"
+        if name not in sys.modules:
+            importlib.import_module(name)
+
+    return Base.metadata
+
+
+def _needs_metadata() -> bool:
+    """Only autogenerate (``revision --autogenerate`` and ``check``) compares against the models."""
+    cmd_opts = config.cmd_opts
+    if cmd_opts is None:
+        # Invoked programmatically (e.g. alembic.command from a test harness); be conservative.
+        return True
+    command = getattr(getattr(cmd_opts, "cmd", (None,))[0], "__name__", None)
+    if command == "check":
+        return True
+    return command == "revision" and bool(getattr(cmd_opts, "autogenerate", False))
+
+
+def _target_metadata():
+    if not _needs_metadata():
+        return None
+    # env.py is re-executed for every command, but a harness that reuses one Config across
+    # runs keeps its attributes, so the populated metadata is resolved once per Config.
+    if "target_metadata" not in config.attributes:
+        config.attributes["target_metadata"] = _load_metadata()
+    return config.attributes["target_metadata"]
+
+
+def _metadata_bootstrap_requested() -> bool:
+    """``alembic -x bootstrap=metadata upgrade head`` opts into the fresh-database fast path."""
+    return context.get_x_argument(as_dictionary=True).get("bootstrap") == "metadata"
+
+
+def _is_empty_database(connection) -> bool:
+    table_names = inspect(connection).get_table_names()
+    # The inspection autobegins a transaction; end it so Alembic owns (and commits) the next one.
+    connection.rollback()
+    return not table_names
+
+
+def _bootstrap_from_metadata(connection) -> None:
+    """Create the final schema straight from the models and stamp head, skipping each revision.
+
+    Only meant for throwaway databases (tests, local dev): the models are not a byte-for-byte
+    match for the migration chain, so deployed databases must keep going through revisions.
+    """
+    metadata = _load_metadata()
+    context.configure(connection=connection, target_metadata=metadata)
+
+    with context.begin_transaction():
+        metadata.create_all(connection)
+        context.get_context().stamp(ScriptDirectory.from_config(config), "heads")
+
+
 def run_migrations_offline() -> None:
     context.configure(
         url=DATABASE_URL,
-        target_metadata=Base.metadata,
+        target_metadata=_target_metadata(),
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -51,11 +100,20 @@ def run_migrations_online() -> None:
     connectable = engine_from_config(
         config.get_section(config.config_ini_section),
         prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
+        # Alembic runs single-threaded; one pooled connection is reused for every statement
+        # instead of paying a fresh connect/auth handshake per checkout.
+        poolclass=pool.QueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_pre_ping=False,
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=Base.metadata)
+        if _metadata_bootstrap_requested() and _is_empty_database(connection):
+            _bootstrap_from_metadata(connection)
+            return
+
+        context.configure(connection=connection, target_metadata=_target_metadata())
 
         with context.begin_transaction():
             context.run_migrations()
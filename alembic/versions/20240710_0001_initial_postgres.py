@@ -4,7 +4,6 @@ from __future__ import annotations
 
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy.dialects import postgresql
 
 
 revision = "20240710_0001_initial_postgres"
@@ -13,68 +12,82 @@ branch_labels = None
 depends_on = None
 
 
-def upgrade() -> None:
-    requirement_status = postgresql.ENUM(
-        "OPEN",
-        "REVIEW",
-        "DONE",
-        name="requirement_status",
-        create_type=False,
+DDL_STATEMENTS: list[str] = [
+    # Create the status type only when missing; no separate catalog probe round trip.
+    """
+    DO $$ BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'requirement_status') THEN
+            CREATE TYPE requirement_status AS ENUM ('OPEN', 'REVIEW', 'DONE');
+        END IF;
+    END $$
+    """,
+    """
+    CREATE TABLE documents (
+        id UUID NOT NULL,
+        org_id UUID NOT NULL,
+        name VARCHAR NOT NULL,
+        storage_url VARCHAR,
+        text_excerpt VARCHAR,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+        extracted_at TIMESTAMP WITH TIME ZONE,
+        PRIMARY KEY (id)
     )
-    requirement_status.create(op.get_bind(), checkfirst=True)
-
-    op.create_table(
-        "documents",
-        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
-        sa.Column("org_id", postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column("name", sa.String(), nullable=False),
-        sa.Column("storage_url", sa.String(), nullable=True),
-        sa.Column("text_excerpt", sa.String(), nullable=True),
-        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
-        sa.Column("extracted_at", sa.DateTime(timezone=True), nullable=True),
+    """,
+    """
+    CREATE TABLE requirements (
+        id UUID NOT NULL,
+        org_id UUID NOT NULL,
+        document_id UUID NOT NULL,
+        title_en VARCHAR NOT NULL,
+        title_es VARCHAR NOT NULL,
+        description_en VARCHAR NOT NULL,
+        description_es VARCHAR NOT NULL,
+        category VARCHAR,
+        frequency VARCHAR,
+        due_date TIMESTAMP WITH TIME ZONE,
+        status requirement_status DEFAULT 'OPEN' NOT NULL,
+        source_ref VARCHAR NOT NULL,
+        confidence FLOAT DEFAULT '0.7' NOT NULL,
+        trade VARCHAR DEFAULT 'electrical' NOT NULL,
+        attributes JSONB DEFAULT '{}'::jsonb NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+        completed_at TIMESTAMP WITH TIME ZONE,
+        PRIMARY KEY (id),
+        FOREIGN KEY (document_id) REFERENCES documents (id) ON DELETE CASCADE
     )
-
-    op.create_table(
-        "requirements",
-        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
-        sa.Column("org_id", postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column("document_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("documents.id", ondelete="CASCADE"), nullable=False),
-        sa.Column("title_en", sa.String(), nullable=False),
-        sa.Column("title_es", sa.String(), nullable=False),
-        sa.Column("description_en", sa.String(), nullable=False),
-        sa.Column("description_es", sa.String(), nullable=False),
-        sa.Column("category", sa.String(), nullable=True),
-        sa.Column("frequency", sa.String(), nullable=True),
-        sa.Column("due_date", sa.DateTime(timezone=True), nullable=True),
-        sa.Column("status", requirement_status, server_default="OPEN", nullable=False),
-        sa.Column("source_ref", sa.String(), nullable=False),
-        sa.Column("confidence", sa.Float(), nullable=False, server_default="0.7"),
-        sa.Column("trade", sa.String(), nullable=False, server_default="electrical"),
-        sa.Column("attributes", postgresql.JSONB(), server_default=sa.text("'{}'::jsonb"), nullable=False),
-        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
-        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+    """,
+    """
+    CREATE TABLE events (
+        id UUID NOT NULL,
+        org_id UUID,
+        document_id UUID,
+        requirement_id UUID,
+        type VARCHAR NOT NULL,
+        data JSONB DEFAULT '{}'::jsonb NOT NULL,
+        at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY (document_id) REFERENCES documents (id) ON DELETE SET NULL,
+        FOREIGN KEY (requirement_id) REFERENCES requirements (id) ON DELETE SET NULL
     )
-
-    op.create_table(
-        "events",
-        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
-        sa.Column("org_id", postgresql.UUID(as_uuid=True), nullable=True),
-        sa.Column("document_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("documents.id", ondelete="SET NULL"), nullable=True),
-        sa.Column("requirement_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("requirements.id", ondelete="SET NULL"), nullable=True),
-        sa.Column("type", sa.String(), nullable=False),
-        sa.Column("data", postgresql.JSONB(), server_default=sa.text("'{}'::jsonb"), nullable=False),
-        sa.Column("at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    """,
+    """
+    CREATE TABLE org_requirement_metrics (
+        id UUID NOT NULL,
+        org_id UUID NOT NULL,
+        requirements_created_total INTEGER DEFAULT '0' NOT NULL,
+        requirements_completed_total INTEGER DEFAULT '0' NOT NULL,
+        completion_time_histogram JSONB DEFAULT '{}'::jsonb NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (org_id)
     )
+    """,
+]
 
-    op.create_table(
-        "org_requirement_metrics",
-        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
-        sa.Column("org_id", postgresql.UUID(as_uuid=True), nullable=False, unique=True),
-        sa.Column("requirements_created_total", sa.Integer(), nullable=False, server_default="0"),
-        sa.Column("requirements_completed_total", sa.Integer(), nullable=False, server_default="0"),
-        sa.Column("completion_time_histogram", postgresql.JSONB(), server_default=sa.text("'{}'::jsonb"), nullable=False),
-        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
-    )
+
+def upgrade() -> None:
+    # Ship the type and every table in a single round trip instead of one per create_table.
+    op.execute(";\n".join(statement.strip() for statement in DDL_STATEMENTS))
 
 
 def downgrade() -> None:
@@ -2,8 +2,6 @@
 
 from __future__ import annotations
 
-import uuid
-
 import sqlalchemy as sa
 from alembic import op
 from sqlalchemy.dialects import postgresql
@@ -20,246 +18,222 @@ membership_role_enum = postgresql.ENUM(
 )
 
 
-def upgrade() -> None:
-    op.execute("DROP TYPE IF EXISTS membership_role")
-    membership_role_enum.create(op.get_bind(), checkfirst=True)
-
-    op.create_table(
-        "orgs",
-        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
-        sa.Column("name", sa.String(), nullable=False),
-        sa.Column("slug", sa.String(), nullable=True),
-        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
-        sa.Column(
-            "updated_at",
-            sa.DateTime(timezone=True),
-            server_default=sa.func.now(),
-            nullable=False,
-        ),
-        sa.UniqueConstraint("slug", name="uq_orgs_slug"),
+DDL_STATEMENTS: list[str] = [
+    # Create the role type only when missing so re-runs don't touch the catalog.
+    """
+    DO $$ BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'membership_role') THEN
+            CREATE TYPE membership_role AS ENUM ('owner', 'admin', 'member');
+        END IF;
+    END $$
+    """,
+    """
+    CREATE TABLE orgs (
+        id UUID NOT NULL,
+        name VARCHAR NOT NULL,
+        slug VARCHAR,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+        PRIMARY KEY (id),
+        CONSTRAINT uq_orgs_slug UNIQUE (slug)
     )
-
-    op.create_table(
-        "users",
-        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
-        sa.Column("email", sa.String(), nullable=False),
-        sa.Column("full_name", sa.String(), nullable=True),
-        sa.Column("preferred_locale", sa.String(), nullable=False, server_default="en"),
-        sa.Column("is_active", sa.Boolean(), nullable=False, server_default=sa.text("true")),
-        sa.Column("last_login_at", sa.DateTime(timezone=True), nullable=True),
-        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
-        sa.Column(
-            "updated_at",
-            sa.DateTime(timezone=True),
-            server_default=sa.func.now(),
-            nullable=False,
-        ),
-        sa.UniqueConstraint("email", name="uq_users_email"),
+    """,
+    """
+    CREATE TABLE users (
+        id UUID NOT NULL,
+        email VARCHAR NOT NULL,
+        full_name VARCHAR,
+        preferred_locale VARCHAR DEFAULT 'en' NOT NULL,
+        is_active BOOLEAN DEFAULT true NOT NULL,
+        last_login_at TIMESTAMP WITH TIME ZONE,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+        PRIMARY KEY (id),
+        CONSTRAINT uq_users_email UNIQUE (email)
     )
-    op.create_index("ix_users_email", "users", ["email"], unique=False)
-
-    op.create_table(
-        "memberships",
-        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
-        sa.Column(
-            "org_id",
-            postgresql.UUID(as_uuid=True),
-            sa.ForeignKey("orgs.id", ondelete="CASCADE"),
-            nullable=False,
-        ),
-        sa.Column(
-            "user_id",
-            postgresql.UUID(as_uuid=True),
-            sa.ForeignKey("users.id", ondelete="CASCADE"),
-            nullable=False,
-        ),
-        sa.Column(
-            "role",
-            membership_role_enum,
-            nullable=False,
-            server_default="member",
-        ),
-        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
-        sa.UniqueConstraint("org_id", "user_id", name="uq_memberships_org_user"),
+    """,
+    "CREATE INDEX ix_users_email ON users (email)",
+    """
+    CREATE TABLE memberships (
+        id UUID NOT NULL,
+        org_id UUID NOT NULL,
+        user_id UUID NOT NULL,
+        role membership_role DEFAULT 'member' NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+        PRIMARY KEY (id),
+        CONSTRAINT uq_memberships_org_user UNIQUE (org_id, user_id),
+        FOREIGN KEY (org_id) REFERENCES orgs (id) ON DELETE CASCADE,
+        FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
     )
-
-    op.create_table(
-        "login_tokens",
-        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
-        sa.Column(
-            "user_id",
-            postgresql.UUID(as_uuid=True),
-            sa.ForeignKey("users.id", ondelete="CASCADE"),
-            nullable=False,
-        ),
-        sa.Column("token_hash", sa.String(), nullable=False),
-        sa.Column("email", sa.String(), nullable=False),
-        sa.Column("purpose", sa.String(), nullable=False, server_default="login"),
-        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
-        sa.Column("consumed_at", sa.DateTime(timezone=True), nullable=True),
-        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
-        sa.UniqueConstraint("token_hash", name="uq_login_tokens_token_hash"),
+    """,
+    """
+    CREATE TABLE login_tokens (
+        id UUID NOT NULL,
+        user_id UUID NOT NULL,
+        token_hash VARCHAR NOT NULL,
+        email VARCHAR NOT NULL,
+        purpose VARCHAR DEFAULT 'login' NOT NULL,
+        expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        consumed_at TIMESTAMP WITH TIME ZONE,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+        PRIMARY KEY (id),
+        CONSTRAINT uq_login_tokens_token_hash UNIQUE (token_hash),
+        FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
     )
-
-    op.create_table(
-        "user_sessions",
-        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
-        sa.Column(
-            "user_id",
-            postgresql.UUID(as_uuid=True),
-            sa.ForeignKey("users.id", ondelete="CASCADE"),
-            nullable=False,
-        ),
-        sa.Column(
-            "org_id",
-            postgresql.UUID(as_uuid=True),
-            sa.ForeignKey("orgs.id", ondelete="CASCADE"),
-            nullable=False,
-        ),
-        sa.Column("session_token_hash", sa.String(), nullable=False),
-        sa.Column("user_agent", sa.String(), nullable=True),
-        sa.Column("ip_address", sa.String(), nullable=True),
-        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
-        sa.Column("revoked_at", sa.DateTime(timezone=True), nullable=True),
-        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
-        sa.UniqueConstraint("session_token_hash", name="uq_user_sessions_token"),
+    """,
+    """
+    CREATE TABLE user_sessions (
+        id UUID NOT NULL,
+        user_id UUID NOT NULL,
+        org_id UUID NOT NULL,
+        session_token_hash VARCHAR NOT NULL,
+        user_agent VARCHAR,
+        ip_address VARCHAR,
+        expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        revoked_at TIMESTAMP WITH TIME ZONE,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+        PRIMARY KEY (id),
+        CONSTRAINT uq_user_sessions_token UNIQUE (session_token_hash),
+        FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+        FOREIGN KEY (org_id) REFERENCES orgs (id) ON DELETE CASCADE
     )
-
-    op.create_table(
-        "permits",
-        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
-        sa.Column(
-            "org_id",
-            postgresql.UUID(as_uuid=True),
-            sa.ForeignKey("orgs.id", ondelete="CASCADE"),
-            nullable=False,
-        ),
-        sa.Column("name", sa.String(), nullable=False),
-        sa.Column("permit_number", sa.String(), nullable=True),
-        sa.Column("permit_type", sa.String(), nullable=True),
-        sa.Column("jurisdiction", sa.String(), nullable=True),
-        sa.Column("issued_at", sa.DateTime(timezone=True), nullable=True),
-        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
-        sa.Column("storage_url", sa.String(), nullable=False),
-        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
-        sa.Column(
-            "updated_at",
-            sa.DateTime(timezone=True),
-            server_default=sa.func.now(),
-            nullable=False,
-        ),
+    """,
+    """
+    CREATE TABLE permits (
+        id UUID NOT NULL,
+        org_id UUID NOT NULL,
+        name VARCHAR NOT NULL,
+        permit_number VARCHAR,
+        permit_type VARCHAR,
+        jurisdiction VARCHAR,
+        issued_at TIMESTAMP WITH TIME ZONE,
+        expires_at TIMESTAMP WITH TIME ZONE,
+        storage_url VARCHAR NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY (org_id) REFERENCES orgs (id) ON DELETE CASCADE
     )
-    op.create_index("ix_permits_org_id", "permits", ["org_id"], unique=False)
-
-    op.create_table(
-        "training_certs",
-        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
-        sa.Column(
-            "org_id",
-            postgresql.UUID(as_uuid=True),
-            sa.ForeignKey("orgs.id", ondelete="CASCADE"),
-            nullable=False,
-        ),
-        sa.Column("worker_name", sa.String(), nullable=False),
-        sa.Column("certification_type", sa.String(), nullable=False),
-        sa.Column("authority", sa.String(), nullable=True),
-        sa.Column("issued_at", sa.DateTime(timezone=True), nullable=True),
-        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
-        sa.Column("storage_url", sa.String(), nullable=False),
-        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
-        sa.Column(
-            "updated_at",
-            sa.DateTime(timezone=True),
-            server_default=sa.func.now(),
-            nullable=False,
-        ),
+    """,
+    "CREATE INDEX ix_permits_org_id ON permits (org_id)",
+    """
+    CREATE TABLE training_certs (
+        id UUID NOT NULL,
+        org_id UUID NOT NULL,
+        worker_name VARCHAR NOT NULL,
+        certification_type VARCHAR NOT NULL,
+        authority VARCHAR,
+        issued_at TIMESTAMP WITH TIME ZONE,
+        expires_at TIMESTAMP WITH TIME ZONE,
+        storage_url VARCHAR NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY (org_id) REFERENCES orgs (id) ON DELETE CASCADE
     )
-    op.create_index("ix_training_certs_org_id", "training_certs", ["org_id"], unique=False)
+    """,
+    "CREATE INDEX ix_training_certs_org_id ON training_certs (org_id)",
+]
 
-    bind = op.get_bind()
-    existing_ids: set[str] = set()
-    for table_name in ["documents", "requirements", "events", "org_requirement_metrics"]:
-        rows = bind.execute(sa.text(f"SELECT DISTINCT org_id FROM {table_name} WHERE org_id IS NOT NULL")).fetchall()
-        existing_ids.update(str(row[0]) for row in rows if row[0] is not None)
-
-    for org_id in existing_ids:
-        bind.execute(
-            sa.text(
-                "INSERT INTO orgs (id, name, slug) VALUES (:id, :name, NULL) "
-                "ON CONFLICT (id) DO NOTHING"
-            ),
-            {"id": uuid.UUID(org_id), "name": "Legacy Org"},
-        )
+# Seed an org row for every org id already referenced by week-1 data, server-side in one statement.
+LEGACY_ORG_BACKFILL = """
+INSERT INTO orgs (id, name)
+SELECT DISTINCT org_id, 'Legacy Org' FROM (
+    SELECT org_id FROM documents WHERE org_id IS NOT NULL
+    UNION ALL SELECT org_id FROM requirements WHERE org_id IS NOT NULL
+    UNION ALL SELECT org_id FROM events WHERE org_id IS NOT NULL
+    UNION ALL SELECT org_id FROM org_requirement_metrics WHERE org_id IS NOT NULL
+) AS legacy
+ON CONFLICT (id) DO NOTHING
+"""
 
+# Tenancy constraints on the week-1 tables; these run after legacy org ids are backfilled.
+# Foreign keys are added NOT VALID so the exclusive lock is held only for the catalog change;
+# the referencing rows are checked afterwards by VALIDATE_CONSTRAINTS.
+ORG_SCOPE_STATEMENTS: list[str] = [
     # documents
-    op.create_index("ix_documents_org_id", "documents", ["org_id"], unique=False)
-    op.create_foreign_key(
-        "fk_documents_org_id",
-        "documents",
-        "orgs",
-        ["org_id"],
-        ["id"],
-        ondelete="CASCADE",
-    )
-
+    """
+    ALTER TABLE documents ADD CONSTRAINT fk_documents_org_id
+        FOREIGN KEY (org_id) REFERENCES orgs (id) ON DELETE CASCADE NOT VALID
+    """,
     # requirements
-    op.create_index("ix_requirements_org_id", "requirements", ["org_id"], unique=False)
-    op.drop_constraint("requirements_document_id_fkey", "requirements", type_="foreignkey")
-    op.create_foreign_key(
-        "fk_requirements_document_id",
-        "requirements",
-        "documents",
-        ["document_id"],
-        ["id"],
-        ondelete="CASCADE",
-    )
-    op.create_foreign_key(
-        "fk_requirements_org_id",
-        "requirements",
-        "orgs",
-        ["org_id"],
-        ["id"],
-        ondelete="CASCADE",
-    )
-
+    """
+    ALTER TABLE requirements
+        DROP CONSTRAINT requirements_document_id_fkey,
+        ADD CONSTRAINT fk_requirements_document_id
+            FOREIGN KEY (document_id) REFERENCES documents (id) ON DELETE CASCADE NOT VALID,
+        ADD CONSTRAINT fk_requirements_org_id
+            FOREIGN KEY (org_id) REFERENCES orgs (id) ON DELETE CASCADE NOT VALID
+    """,
     # events
-    op.create_index("ix_events_org_id", "events", ["org_id"], unique=False)
-    op.add_column(
-        "events",
-        sa.Column(
-            "org_id_temp",
-            postgresql.UUID(as_uuid=True),
-            nullable=True,
-        ),
-    )
-    op.execute("UPDATE events SET org_id_temp = org_id")
-    op.drop_column("events", "org_id")
-    op.alter_column("events", "org_id_temp", nullable=False)
-    op.alter_column("events", "org_id_temp", new_column_name="org_id")
-    op.create_foreign_key(
-        "fk_events_org_id",
-        "events",
-        "orgs",
-        ["org_id"],
-        ["id"],
-        ondelete="CASCADE",
-    )
-
+    # Attribute org-less events through their document, drop whatever is left, then flip
+    # NOT NULL in place; the column type is unchanged so no table rewrite is needed.
+    """
+    UPDATE events SET org_id = documents.org_id
+    FROM documents
+    WHERE events.org_id IS NULL AND events.document_id = documents.id
+    """,
+    "DELETE FROM events WHERE org_id IS NULL",
+    "ALTER TABLE events ALTER COLUMN org_id SET NOT NULL",
+    """
+    ALTER TABLE events ADD CONSTRAINT fk_events_org_id
+        FOREIGN KEY (org_id) REFERENCES orgs (id) ON DELETE CASCADE NOT VALID
+    """,
     # org metrics
-    op.drop_constraint("org_requirement_metrics_org_id_key", "org_requirement_metrics", type_="unique")
-    op.create_unique_constraint(
-        "uq_org_requirement_metrics_org_id",
-        "org_requirement_metrics",
-        ["org_id"],
-    )
-    op.create_foreign_key(
-        "fk_org_requirement_metrics_org_id",
-        "org_requirement_metrics",
-        "orgs",
-        ["org_id"],
-        ["id"],
-        ondelete="CASCADE",
-    )
+    "ALTER TABLE org_requirement_metrics DROP CONSTRAINT org_requirement_metrics_org_id_key",
+    "ALTER TABLE org_requirement_metrics ADD CONSTRAINT uq_org_requirement_metrics_org_id UNIQUE (org_id)",
+    """
+    ALTER TABLE org_requirement_metrics ADD CONSTRAINT fk_org_requirement_metrics_org_id
+        FOREIGN KEY (org_id) REFERENCES orgs (id) ON DELETE CASCADE NOT VALID
+    """,
+]
+
+# VALIDATE CONSTRAINT only takes SHARE UPDATE EXCLUSIVE, so writers keep going while it scans.
+VALIDATE_CONSTRAINTS: list[str] = [
+    "ALTER TABLE documents VALIDATE CONSTRAINT fk_documents_org_id",
+    "ALTER TABLE requirements VALIDATE CONSTRAINT fk_requirements_document_id",
+    "ALTER TABLE requirements VALIDATE CONSTRAINT fk_requirements_org_id",
+    "ALTER TABLE events VALIDATE CONSTRAINT fk_events_org_id",
+    "ALTER TABLE org_requirement_metrics VALIDATE CONSTRAINT fk_org_requirement_metrics_org_id",
+]
+
+# The week-1 tables already hold data, so their indexes are built without blocking writers.
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction block, hence one statement each.
+CONCURRENT_INDEXES: list[str] = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_org_id ON documents (org_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_requirements_org_id ON requirements (org_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_events_org_id ON events (org_id)",
+]
+
+# The backfill and the events cleanup leave planner statistics stale until autovacuum runs.
+ANALYZE_TABLES: list[str] = [
+    "ANALYZE orgs",
+    "ANALYZE documents",
+    "ANALYZE requirements",
+    "ANALYZE events",
+    "ANALYZE org_requirement_metrics",
+]
+
+
+def _execute_batch(statements: list[str]) -> None:
+    """Send a group of DDL statements to the server in a single round trip."""
+    op.execute(";\n".join(statement.strip() for statement in statements))
+
+
+def upgrade() -> None:
+    _execute_batch(DDL_STATEMENTS)
+
+    op.execute(sa.text(LEGACY_ORG_BACKFILL))
+
+    _execute_batch(ORG_SCOPE_STATEMENTS)
+
+    with op.get_context().autocommit_block():
+        for statement in VALIDATE_CONSTRAINTS:
+            op.execute(statement)
+        for statement in CONCURRENT_INDEXES:
+            op.execute(statement)
+
+    _execute_batch(ANALYZE_TABLES)
 
 
 def downgrade() -> None:
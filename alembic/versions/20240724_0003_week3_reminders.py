@@ -2,9 +2,7 @@
 
 from __future__ import annotations
 
-import sqlalchemy as sa
 from alembic import op
-from sqlalchemy.dialects import postgresql
 
 
 revision = "20240724_0003_week3_reminders"
@@ -13,137 +11,61 @@ branch_labels = None
 depends_on = None
 
 
-reminder_status_enum = postgresql.ENUM(
-    "PENDING", "SENT", "FAILED", name="reminder_status", create_type=False
-)
-
-
-def upgrade() -> None:
-    op.add_column(
-        "requirements",
-        sa.Column("next_due", sa.DateTime(timezone=True), nullable=True),
-    )
-
-    reminder_status_enum.create(op.get_bind(), checkfirst=True)
-
-    op.create_table(
-        "reminder_jobs",
-        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
-        sa.Column(
-            "org_id",
-            postgresql.UUID(as_uuid=True),
-            sa.ForeignKey("orgs.id", ondelete="CASCADE"),
-            nullable=False,
-        ),
-        sa.Column("target_type", sa.String(), nullable=False),
-        sa.Column("target_id", postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column("target_due_at", sa.DateTime(timezone=True), nullable=True),
-        sa.Column("reminder_offset_days", sa.Integer(), nullable=False),
-        sa.Column("run_at", sa.DateTime(timezone=True), nullable=False),
-        sa.Column("recipient_email", sa.String(), nullable=False),
-        sa.Column("recipient_locale", sa.String(), nullable=False, server_default="en"),
-        sa.Column(
-            "status",
-            reminder_status_enum,
-            nullable=False,
-            server_default="PENDING",
-        ),
-        sa.Column("attempts", sa.Integer(), nullable=False, server_default=sa.text("0")),
-        sa.Column("last_attempt_at", sa.DateTime(timezone=True), nullable=True),
-        sa.Column("last_error", sa.String(), nullable=True),
-        sa.Column(
-            "payload",
-            postgresql.JSONB(astext_type=sa.Text()),
-            nullable=False,
-            server_default=sa.text("'{}'::jsonb"),
-        ),
-        sa.Column(
-            "created_at",
-            sa.DateTime(timezone=True),
-            server_default=sa.func.now(),
-            nullable=False,
-        ),
-        sa.Column(
-            "updated_at",
-            sa.DateTime(timezone=True),
-            server_default=sa.func.now(),
-            nullable=False,
-        ),
-        sa.UniqueConstraint(
-            "target_type",
-            "target_id",
-            "recipient_email",
-            "reminder_offset_days",
-            "target_due_at",
-            name="uq_reminder_jobs_target_offset",
+DDL_STATEMENTS: list[str] = [
+    # Create the status type only when missing; no separate catalog probe round trip.
+    """
+    DO $$ BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'reminder_status') THEN
+            CREATE TYPE reminder_status AS ENUM ('PENDING', 'SENT', 'FAILED');
+        END IF;
+    END $$
+    """,
+    "ALTER TABLE requirements ADD COLUMN next_due TIMESTAMP WITH TIME ZONE",
+    """
+    CREATE TABLE reminder_jobs (
+        id UUID NOT NULL,
+        org_id UUID NOT NULL,
+        target_type VARCHAR NOT NULL,
+        target_id UUID NOT NULL,
+        target_due_at TIMESTAMP WITH TIME ZONE,
+        reminder_offset_days INTEGER NOT NULL,
+        run_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        recipient_email VARCHAR NOT NULL,
+        recipient_locale VARCHAR DEFAULT 'en' NOT NULL,
+        status reminder_status DEFAULT 'PENDING' NOT NULL,
+        attempts INTEGER DEFAULT 0 NOT NULL,
+        last_attempt_at TIMESTAMP WITH TIME ZONE,
+        last_error VARCHAR,
+        payload JSONB DEFAULT '{}'::jsonb NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+        PRIMARY KEY (id),
+        CONSTRAINT uq_reminder_jobs_target_offset UNIQUE (
+            target_type, target_id, recipient_email, reminder_offset_days, target_due_at
         ),
+        FOREIGN KEY (org_id) REFERENCES orgs (id) ON DELETE CASCADE
     )
-    op.create_index("ix_reminder_jobs_org_id", "reminder_jobs", ["org_id"], unique=False)
-    op.create_index("ix_reminder_jobs_run_at", "reminder_jobs", ["run_at"], unique=False)
+    """,
+    "CREATE INDEX ix_reminder_jobs_org_id ON reminder_jobs (org_id)",
+    # dispatch_reminders polls PENDING jobs by run_at; sent/failed history never enters the index.
+    "CREATE INDEX ix_reminder_jobs_pending_run_at ON reminder_jobs (run_at) WHERE status = 'PENDING'",
+    # One ALTER for all seven metrics columns: a single lock acquisition and catalog update.
+    """
+    ALTER TABLE org_requirement_metrics
+        ADD COLUMN reminders_scheduled_total INTEGER DEFAULT 0 NOT NULL,
+        ADD COLUMN reminders_sent_total INTEGER DEFAULT 0 NOT NULL,
+        ADD COLUMN reminders_failed_total INTEGER DEFAULT 0 NOT NULL,
+        ADD COLUMN overdue_completion_total INTEGER DEFAULT 0 NOT NULL,
+        ADD COLUMN post_reminder_completion_total INTEGER DEFAULT 0 NOT NULL,
+        ADD COLUMN overdue_completion_histogram JSONB DEFAULT '{}'::jsonb NOT NULL,
+        ADD COLUMN post_reminder_completion_histogram JSONB DEFAULT '{}'::jsonb NOT NULL
+    """,
+]
 
-    op.add_column(
-        "org_requirement_metrics",
-        sa.Column(
-            "reminders_scheduled_total",
-            sa.Integer(),
-            nullable=False,
-            server_default=sa.text("0"),
-        ),
-    )
-    op.add_column(
-        "org_requirement_metrics",
-        sa.Column(
-            "reminders_sent_total",
-            sa.Integer(),
-            nullable=False,
-            server_default=sa.text("0"),
-        ),
-    )
-    op.add_column(
-        "org_requirement_metrics",
-        sa.Column(
-            "reminders_failed_total",
-            sa.Integer(),
-            nullable=False,
-            server_default=sa.text("0"),
-        ),
-    )
-    op.add_column(
-        "org_requirement_metrics",
-        sa.Column(
-            "overdue_completion_total",
-            sa.Integer(),
-            nullable=False,
-            server_default=sa.text("0"),
-        ),
-    )
-    op.add_column(
-        "org_requirement_metrics",
-        sa.Column(
-            "post_reminder_completion_total",
-            sa.Integer(),
-            nullable=False,
-            server_default=sa.text("0"),
-        ),
-    )
-    op.add_column(
-        "org_requirement_metrics",
-        sa.Column(
-            "overdue_completion_histogram",
-            postgresql.JSONB(astext_type=sa.Text()),
-            nullable=False,
-            server_default=sa.text("'{}'::jsonb"),
-        ),
-    )
-    op.add_column(
-        "org_requirement_metrics",
-        sa.Column(
-            "post_reminder_completion_histogram",
-            postgresql.JSONB(astext_type=sa.Text()),
-            nullable=False,
-            server_default=sa.text("'{}'::jsonb"),
-        ),
-    )
+
+def upgrade() -> None:
+    # Ship the whole revision in a single round trip instead of one per operation.
+    op.execute(";\n".join(statement.strip() for statement in DDL_STATEMENTS))
 
 
 def downgrade() -> None:
@@ -155,7 +77,7 @@ def downgrade() -> None:
     op.drop_column("org_requirement_metrics", "reminders_sent_total")
     op.drop_column("org_requirement_metrics", "reminders_scheduled_total")
 
-    op.drop_index("ix_reminder_jobs_run_at", table_name="reminder_jobs")
+    op.drop_index("ix_reminder_jobs_pending_run_at", table_name="reminder_jobs")
     op.drop_index("ix_reminder_jobs_org_id", table_name="reminder_jobs")
     op.drop_table("reminder_jobs")
 
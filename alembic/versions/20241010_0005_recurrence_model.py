@@ -7,7 +7,7 @@ Create Date: 2024-10-10 00:00:00.000000
 
 from __future__ import annotations
 
-from alembic import op
+from alembic import context, op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
 
@@ -56,11 +56,42 @@ FREQUENCY_MIGRATION_MAP: dict[str, str] = {
     "one-time": "ONE_TIME",
 }
 
+# USING does not allow subqueries, so the legacy mapping is a simple CASE; values travel as
+# bind parameters rather than being formatted into the SQL string.
+FREQUENCY_MIGRATION_PARAMS: dict[str, str] = {}
+for _index, (_legacy, _enum_value) in enumerate(FREQUENCY_MIGRATION_MAP.items()):
+    FREQUENCY_MIGRATION_PARAMS[f"legacy_{_index}"] = _legacy
+    FREQUENCY_MIGRATION_PARAMS[f"enum_{_index}"] = _enum_value
+
+FREQUENCY_MIGRATION_CASE = (
+    "CASE lower(frequency) "
+    + " ".join(
+        f"WHEN :legacy_{index} THEN CAST(:enum_{index} AS requirement_frequency)"
+        for index in range(len(FREQUENCY_MIGRATION_MAP))
+    )
+    + " ELSE NULL END"
+)
+
 
 def upgrade() -> None:
     bind = op.get_bind()
-    requirement_frequency.create(bind, checkfirst=True)
-    requirement_anchor_type.create(bind, checkfirst=True)
+    # One statement creates whichever of the two types is missing, instead of a checkfirst
+    # probe plus CREATE TYPE per enum.
+    op.execute(
+        """
+        DO $$ BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'requirement_frequency') THEN
+                CREATE TYPE requirement_frequency AS ENUM ({frequency_labels});
+            END IF;
+            IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'requirement_anchor_type') THEN
+                CREATE TYPE requirement_anchor_type AS ENUM ({anchor_labels});
+            END IF;
+        END $$
+        """.format(
+            frequency_labels=", ".join(f"'{label}'" for label in requirement_frequency.enums),
+            anchor_labels=", ".join(f"'{label}'" for label in requirement_anchor_type.enums),
+        )
+    )
 
     op.add_column(
         "requirements",
@@ -76,33 +107,29 @@ def upgrade() -> None:
         ),
     )
 
-    op.add_column(
-        "requirements",
-        sa.Column("frequency_new", requirement_frequency, nullable=True),
+    # Convert the column in place: a single rewrite, no temporary column, same ordinal position.
+    # Fresh installs (or tables with no frequency values) skip the per-row CASE entirely.
+    has_frequencies = context.is_offline_mode() or (
+        bind.execute(
+            sa.text("SELECT 1 FROM requirements WHERE frequency IS NOT NULL LIMIT 1")
+        ).first()
+        is not None
     )
-
-    migration_case = "CASE\n"
-    for legacy, enum_value in FREQUENCY_MIGRATION_MAP.items():
-        migration_case += (
-            "        WHEN lower(frequency) = '{legacy}' THEN '{enum}'::requirement_frequency\n".format(
-                legacy=legacy,
-                enum=enum_value,
-            )
+    if has_frequencies:
+        op.execute(
+            sa.text(
+                """
+                ALTER TABLE requirements
+                ALTER COLUMN frequency TYPE requirement_frequency
+                USING ({case})
+                """.format(case=FREQUENCY_MIGRATION_CASE)
+            ).bindparams(**FREQUENCY_MIGRATION_PARAMS)
         )
-    migration_case += "        ELSE NULL\n    END"
-
-    op.execute(
-        sa.text(
-            """
-            UPDATE requirements
-            SET frequency_new = {case}
-            """.format(case=migration_case)
+    else:
+        op.execute(
+            "ALTER TABLE requirements "
+            "ALTER COLUMN frequency TYPE requirement_frequency USING NULL::requirement_frequency"
         )
-    )
-
-    op.alter_column("requirements", "frequency", new_column_name="frequency_old")
-    op.alter_column("requirements", "frequency_new", new_column_name="frequency")
-    op.drop_column("requirements", "frequency_old")
 
     op.create_table(
         "requirement_history",
@@ -120,6 +147,9 @@ def upgrade() -> None:
         ["requirement_id"],
     )
 
+    # The frequency rewrite invalidates the column statistics the planner relies on.
+    op.execute("ANALYZE requirements")
+
 
 def downgrade() -> None:
     bind = op.get_bind()
@@ -127,36 +157,22 @@ def downgrade() -> None:
     op.drop_index("ix_requirement_history_requirement_id", table_name="requirement_history")
     op.drop_table("requirement_history")
 
-    op.add_column(
-        "requirements",
-        sa.Column("frequency_old", sa.String(), nullable=True),
-    )
-
+    # Mirror of the upgrade: one in-place rewrite back to VARCHAR. Enum labels are the legacy
+    # spellings upper-cased, so only the ones containing spaces need an explicit arm.
     op.execute(
-        sa.text(
-            """
-            UPDATE requirements
-            SET frequency_old = CASE
-                WHEN frequency = 'BEFORE_EACH_USE' THEN 'before each use'
-                WHEN frequency = 'DAILY' THEN 'daily'
-                WHEN frequency = 'WEEKLY' THEN 'weekly'
-                WHEN frequency = 'MONTHLY' THEN 'monthly'
-                WHEN frequency = 'QUARTERLY' THEN 'quarterly'
-                WHEN frequency = 'ANNUAL' THEN 'annual'
-                WHEN frequency = 'EVERY_N_DAYS' THEN 'every_n_days'
-                WHEN frequency = 'EVERY_N_WEEKS' THEN 'every_n_weeks'
-                WHEN frequency = 'EVERY_N_MONTHS' THEN 'every_n_months'
-                WHEN frequency = 'ONE_TIME' THEN 'one time'
-                ELSE NULL
+        """
+        ALTER TABLE requirements
+        ALTER COLUMN frequency TYPE VARCHAR
+        USING (
+            CASE frequency::text
+                WHEN 'BEFORE_EACH_USE' THEN 'before each use'
+                WHEN 'ONE_TIME' THEN 'one time'
+                ELSE lower(frequency::text)
             END
-            """
         )
+        """
     )
 
-    op.alter_column("requirements", "frequency", new_column_name="frequency_enum")
-    op.alter_column("requirements", "frequency_old", new_column_name="frequency")
-    op.drop_column("requirements", "frequency_enum")
-
     op.drop_column("requirements", "anchor_value")
     op.drop_column("requirements", "anchor_type")
 
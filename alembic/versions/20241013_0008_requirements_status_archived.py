@@ -11,14 +11,33 @@ depends_on = None
 
 
 def upgrade() -> None:
-    op.execute("ALTER TYPE requirement_status ADD VALUE IF NOT EXISTS 'ARCHIVED'")
+    # Commit the new label right away instead of holding the type lock for the rest of the run.
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE requirement_status ADD VALUE IF NOT EXISTS 'ARCHIVED'")
 
 
 def downgrade() -> None:
+    # Postgres cannot drop enum values, so the type is rebuilt and the column re-cast (one rewrite).
+    # Refuse up front rather than fail mid-cast on rows still using the removed value.
+    op.execute(
+        """
+        DO $$ BEGIN
+            IF EXISTS (SELECT 1 FROM requirements WHERE status::text IN ('ARCHIVED')) THEN
+                RAISE EXCEPTION 'requirements still use status ARCHIVED; move them before downgrading';
+            END IF;
+        END $$
+        """
+    )
+    op.execute("SET LOCAL lock_timeout = '5s'")
     op.execute("ALTER TYPE requirement_status RENAME TO requirement_status_old")
-    op.execute("CREATE TYPE requirement_status AS ENUM ('OPEN', 'REVIEW', 'DONE')")
+    op.execute("CREATE TYPE requirement_status AS ENUM ('OPEN', 'REVIEW', 'DONE', 'PENDING_REVIEW', 'READY')")
+    # The 'OPEN' default cannot be cast automatically, so it is dropped and restored around the cast.
     op.execute(
-        "ALTER TABLE requirements ALTER COLUMN status TYPE requirement_status USING "
-        "status::text::requirement_status"
+        """
+        ALTER TABLE requirements
+            ALTER COLUMN status DROP DEFAULT,
+            ALTER COLUMN status TYPE requirement_status USING status::text::requirement_status,
+            ALTER COLUMN status SET DEFAULT 'OPEN'
+        """
     )
     op.execute("DROP TYPE requirement_status_old")
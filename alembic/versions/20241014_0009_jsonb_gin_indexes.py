@@ -0,0 +1,35 @@
+"""Add GIN indexes on filtered JSONB columns"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "20241014_0009"
+down_revision = "20241013_0008"
+branch_labels = None
+depends_on = None
+
+# jsonb_path_ops only serves @> containment, but it is a fraction of the size of the default
+# jsonb_ops opclass. Both tables already hold data, so the indexes are built without blocking writers.
+CONCURRENT_INDEXES: list[str] = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_events_data_gin ON events USING gin (data jsonb_path_ops)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_requirements_attributes_gin "
+    "ON requirements USING gin (attributes jsonb_path_ops)",
+]
+
+DROP_INDEXES: list[str] = [
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_requirements_attributes_gin",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_events_data_gin",
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for statement in CONCURRENT_INDEXES:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for statement in DROP_INDEXES:
+            op.execute(statement)
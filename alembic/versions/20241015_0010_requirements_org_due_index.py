@@ -0,0 +1,35 @@
+"""Index requirements by (org_id, due_date)"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "20241015_0010"
+down_revision = "20241014_0009"
+branch_labels = None
+depends_on = None
+
+# The requirements list filters by org and due-date window and sorts by due_date (NULLS LAST matches
+# the btree default), so one composite index serves filter and order. Its org_id prefix also covers
+# everything the single-column index did, which is dropped to save the extra write per row.
+UPGRADE_STATEMENTS: list[str] = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_requirements_org_id_due_date ON requirements (org_id, due_date)",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_requirements_org_id",
+]
+
+DOWNGRADE_STATEMENTS: list[str] = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_requirements_org_id ON requirements (org_id)",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_requirements_org_id_due_date",
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for statement in UPGRADE_STATEMENTS:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for statement in DOWNGRADE_STATEMENTS:
+            op.execute(statement)
@@ -0,0 +1,33 @@
+"""Store token hashes as raw SHA-256 digests"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "20241016_0011"
+down_revision = "20241015_0010"
+branch_labels = None
+depends_on = None
+
+# The hashes were stored as 64-char hex text; the raw 32-byte digest halves the column and the
+# unique btree indexes behind every token lookup. Existing values are decoded in place, so live
+# sessions and unexpired magic links keep working. The unique constraints are rebuilt by the rewrite.
+UPGRADE_STATEMENTS: list[str] = [
+    "SET LOCAL lock_timeout = '5s'",
+    "ALTER TABLE user_sessions ALTER COLUMN session_token_hash TYPE bytea USING decode(session_token_hash, 'hex')",
+    "ALTER TABLE login_tokens ALTER COLUMN token_hash TYPE bytea USING decode(token_hash, 'hex')",
+]
+
+DOWNGRADE_STATEMENTS: list[str] = [
+    "SET LOCAL lock_timeout = '5s'",
+    "ALTER TABLE user_sessions ALTER COLUMN session_token_hash TYPE varchar USING encode(session_token_hash, 'hex')",
+    "ALTER TABLE login_tokens ALTER COLUMN token_hash TYPE varchar USING encode(token_hash, 'hex')",
+]
+
+
+def upgrade() -> None:
+    op.execute(";\n".join(UPGRADE_STATEMENTS))
+
+
+def downgrade() -> None:
+    op.execute(";\n".join(DOWNGRADE_STATEMENTS))
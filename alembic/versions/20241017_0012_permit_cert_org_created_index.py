@@ -0,0 +1,38 @@
+"""Index permits and training certs by (org_id, created_at)"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "20241017_0012"
+down_revision = "20241016_0011"
+branch_labels = None
+depends_on = None
+
+# Both list endpoints filter by org and sort by created_at DESC; the composite index returns rows
+# already ordered (scanned backwards) and its org_id prefix replaces the single-column index.
+UPGRADE_STATEMENTS: list[str] = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_permits_org_id_created_at ON permits (org_id, created_at)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_training_certs_org_id_created_at ON training_certs (org_id, created_at)",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_permits_org_id",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_training_certs_org_id",
+]
+
+DOWNGRADE_STATEMENTS: list[str] = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_permits_org_id ON permits (org_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_training_certs_org_id ON training_certs (org_id)",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_permits_org_id_created_at",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_training_certs_org_id_created_at",
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for statement in UPGRADE_STATEMENTS:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for statement in DOWNGRADE_STATEMENTS:
+            op.execute(statement)
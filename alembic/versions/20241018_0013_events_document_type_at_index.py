@@ -0,0 +1,32 @@
+"""Index events by (document_id, type, at DESC)"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "20241018_0013"
+down_revision = "20241017_0012"
+branch_labels = None
+depends_on = None
+
+# Document status, classification, file-hash and download lookups all fetch the latest event of a
+# type for a document; this index serves both the per-document LIMIT 1 and the DISTINCT ON batch.
+UPGRADE_STATEMENTS: list[str] = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_events_doc_type_at ON events (document_id, type, at DESC)",
+]
+
+DOWNGRADE_STATEMENTS: list[str] = [
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_events_doc_type_at",
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for statement in UPGRADE_STATEMENTS:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for statement in DOWNGRADE_STATEMENTS:
+            op.execute(statement)
@@ -0,0 +1,54 @@
+"""Queue table for out-of-process document extraction"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "20241019_0014"
+down_revision = "20241018_0013"
+branch_labels = None
+depends_on = None
+
+UPGRADE_STATEMENTS: list[str] = [
+    """
+    DO $$ BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'document_job_status') THEN
+            CREATE TYPE document_job_status AS ENUM ('PENDING', 'DONE', 'FAILED');
+        END IF;
+    END $$
+    """,
+    """
+    CREATE TABLE document_jobs (
+        id UUID NOT NULL,
+        org_id UUID NOT NULL,
+        document_id UUID NOT NULL,
+        run_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+        status document_job_status DEFAULT 'PENDING' NOT NULL,
+        attempts INTEGER DEFAULT 0 NOT NULL,
+        last_attempt_at TIMESTAMP WITH TIME ZONE,
+        last_error VARCHAR,
+        payload JSONB DEFAULT '{}'::jsonb NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY (org_id) REFERENCES orgs (id) ON DELETE CASCADE,
+        FOREIGN KEY (document_id) REFERENCES documents (id) ON DELETE CASCADE
+    )
+    """,
+    "CREATE INDEX ix_document_jobs_org_id ON document_jobs (org_id)",
+    # The document worker polls PENDING jobs by run_at; finished jobs never enter the index.
+    "CREATE INDEX ix_document_jobs_pending_run_at ON document_jobs (run_at) WHERE status = 'PENDING'",
+]
+
+DOWNGRADE_STATEMENTS: list[str] = [
+    "DROP TABLE IF EXISTS document_jobs",
+    "DROP TYPE IF EXISTS document_job_status",
+]
+
+
+def upgrade() -> None:
+    op.execute(";\n".join(statement.strip() for statement in UPGRADE_STATEMENTS))
+
+
+def downgrade() -> None:
+    op.execute(";\n".join(DOWNGRADE_STATEMENTS))
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import uuid
+
 import typer
+from sqlalchemy import and_, select
 
 from .config import settings
 from .db.session import SessionLocal
-from .models import Membership, MembershipRole, Org, User
-from .services.auth import AuthService
+from .models import Membership, MembershipRole, Org
 
 app = typer.Typer(help="Compliance Copilot administrative CLI")
 
@@ -18,28 +20,35 @@ def create_org_user(
     locale: str = typer.Option("en", "--locale", "-l", show_default=True, help="Preferred locale (en/es)"),
 ) -> None:
     """Create a user, organization, and membership in one step."""
+    from .services.auth import AuthService
+
     db = SessionLocal()
     try:
         auth = AuthService(db)
-        user = auth.get_or_create_user(email, locale)
+        # New rows get client-side ids, so the user and org go out together in one flush.
+        user = auth.get_or_create_user(email, locale, flush=False)
         if full_name:
             user.full_name = full_name
-        db.flush()
 
-        existing_org = db.query(Org).filter(Org.name == org_name).one_or_none()
-        if existing_org:
-            org = existing_org
-        else:
-            org = Org(name=org_name)
+        # Org and any existing membership for this user come back from one outer-joined SELECT.
+        # Org names aren't unique; one_or_none() refuses to guess which org the OWNER joins.
+        row = db.execute(
+            select(Org, Membership)
+            .outerjoin(
+                Membership,
+                and_(Membership.org_id == Org.id, Membership.user_id == user.id),
+            )
+            .where(Org.name == org_name)
+        ).one_or_none()
+        org, membership = row if row else (None, None)
+        if not org:
+            org = Org(id=uuid.uuid4(), name=org_name)
             db.add(org)
-            db.flush()
 
-        membership = (
-            db.query(Membership)
-            .filter(Membership.user_id == user.id, Membership.org_id == org.id)
-            .one_or_none()
-        )
         if not membership:
+            # Flush the new user/org first. Without relationship()s the unit of work does not order
+            # these mappers by foreign key, and in a single flush memberships is inserted before orgs.
+            db.flush()
             membership = Membership(user_id=user.id, org_id=org.id, role=MembershipRole.OWNER)
             db.add(membership)
 
@@ -52,6 +61,8 @@ def create_org_user(
 @app.command()
 def send_magic_link(email: str = typer.Argument(...)) -> None:
     """Send a login magic link to an email address."""
+    from .services.auth import AuthService
+
     db = SessionLocal()
     try:
         AuthService(db).request_magic_link(email)
@@ -1,12 +1,34 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
 
 from ..config import settings
 
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
-SessionLocal = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+__all__ = ["engine", "SessionLocal", "get_engine"]
 
 
-def get_engine():
+# Connections are retired by age (pool_recycle, kept under typical LB/proxy idle timeouts) rather
+# than pinged on every checkout; DB_POOL_PRE_PING=true restores the ping behind flaky middleboxes.
+# LIFO checkout keeps reusing the warmest connections and lets surplus ones age out.
+# values_plus_batch folds ORM bulk INSERTs into multi-row VALUES pages and sends executemany
+# UPDATE/DELETE through psycopg2's execute_batch, instead of one round trip per row.
+engine = create_engine(
+    settings.database_url,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    pool_use_lifo=True,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    executemany_mode="values_plus_batch",
+    insertmanyvalues_page_size=1000,
+    executemany_batch_page_size=500,
+)
+# Plain factory: get_db already scopes a session to each request, so thread-local registries add
+# nothing. Objects stay loaded after commit instead of being re-SELECTed on next access.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+
+def get_engine() -> Engine:
     return engine
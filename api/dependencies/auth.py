@@ -1,14 +1,24 @@
 from __future__ import annotations
 
+import threading
+import time
 from dataclasses import dataclass
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 
-from fastapi import HTTPException, Request, Response, status
+from fastapi import BackgroundTasks, Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session
 
 from ..config import settings
 from ..models import Org, User, UserSession
 from ..services.auth import AuthError, AuthService
-from ..db.session import SessionLocal
+from .db import get_db
+
+
+# Cookie attributes are fixed for the life of the process; resolve them once at import.
+_COOKIE_NAME = settings.cookie_name
+_COOKIE_DOMAIN = settings.cookie_domain
+_COOKIE_SECURE = settings.environment == "production"
+_COOKIE_MAX_AGE = int(timedelta(hours=settings.session_ttl_hours).total_seconds())
 
 
 @dataclass
@@ -18,20 +28,86 @@ class AuthContext:
     session: UserSession
 
 
-def require_auth(request: Request) -> AuthContext:
-    raw_token = request.cookies.get(settings.cookie_name)
-    with SessionLocal() as db:
+# Opt-in (SESSION_CACHE_TTL_SECONDS > 0), short-lived, in-process cache of detached (session, user,
+# org) rows keyed by token hash, so a burst of requests from one browser resolves the cookie with a
+# single query. Entries are never
+# handed out directly; each request gets its own copies.
+#
+# Hits are not re-checked against the database. Logout evicts the entry only in the process that
+# served it, so with several API workers a revoked session, or a user deactivated since the entry
+# was cached, stays accepted elsewhere until SESSION_CACHE_TTL_SECONDS lapses.
+_SESSION_CACHE_MAX_ENTRIES = 10_000
+_session_cache: dict[bytes, tuple[float, tuple[UserSession, User, Org]]] = {}
+_session_cache_lock = threading.Lock()
+
+
+def _cached_session_row(token_hash: bytes) -> tuple[UserSession, User, Org] | None:
+    if settings.session_cache_ttl_seconds <= 0:
+        return None
+    with _session_cache_lock:
+        entry = _session_cache.get(token_hash)
+    if entry is None:
+        return None
+
+    cached_at, row = entry
+    if (
+        time.monotonic() - cached_at > settings.session_cache_ttl_seconds
+        or row[0].expires_at <= datetime.now(timezone.utc)
+    ):
+        forget_cached_session(token_hash)
+        return None
+    return row
+
+
+def _remember_session_row(token_hash: bytes, row: tuple[UserSession, User, Org]) -> None:
+    if settings.session_cache_ttl_seconds <= 0:
+        return
+    with _session_cache_lock:
+        if len(_session_cache) >= _SESSION_CACHE_MAX_ENTRIES:
+            _session_cache.pop(next(iter(_session_cache)))
+        _session_cache[token_hash] = (time.monotonic(), row)
+
+
+def forget_cached_session(token_hash: bytes) -> None:
+    """Drop a session from this process's lookup cache after it is revoked or its user changes."""
+    with _session_cache_lock:
+        _session_cache.pop(token_hash, None)
+
+
+def clear_session_cache() -> None:
+    with _session_cache_lock:
+        _session_cache.clear()
+
+
+def require_auth(request: Request, db: Session = Depends(get_db)) -> AuthContext:
+    # Resolve the token once per request, however many dependencies ask for it.
+    cached = getattr(request.state, "auth_context", None)
+    if cached is not None:
+        return cached
+
+    raw_token = request.cookies.get(_COOKIE_NAME) or ""
+    token_hash = AuthService.hash_token(raw_token)
+    row = _cached_session_row(token_hash) if raw_token else None
+    if row is None:
         service = AuthService(db)
-        row = service.session_from_token(raw_token or "")
+        row = service.session_from_token(raw_token)
         if not row:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication required")
-
-        session, user, org = row
-        request.state.user_id = str(user.id)
-        request.state.org_id = str(org.id)
-        # detach objects before session closes
-        db.expunge_all()
-        return AuthContext(user=user, org=org, session=session)
+        for obj in row:
+            db.expunge(obj)
+        _remember_session_row(token_hash, row)
+
+    # Fresh per-request copies of the cached rows; load=False builds them without any SQL.
+    session, user, org = [db.merge(obj, load=False) for obj in row]
+    request.state.user_id = str(user.id)
+    request.state.org_id = str(org.id)
+    # detach only the auth objects so they outlive the request session (background tasks, later
+    # commits); anything else the request session has loaded stays attached
+    for obj in (session, user, org):
+        db.expunge(obj)
+    context = AuthContext(user=user, org=org, session=session)
+    request.state.auth_context = context
+    return context
 
 
 def issue_magic_link(
@@ -40,18 +116,31 @@ def issue_magic_link(
     request: Request,
     db: Session,
     redirect_path: str | None = None,
+    background_tasks: BackgroundTasks | None = None,
 ) -> str:
+    """Issue a login link; with background_tasks the email goes out after the response is sent."""
     service = AuthService(db)
     try:
-        return service.request_magic_link(
+        magic_link = service.request_magic_link(
             email=email,
             preferred_locale=locale,
             request_ip=request.client.host if request.client else None,
             user_agent=request.headers.get("user-agent"),
             redirect_path=redirect_path,
+            send_email=background_tasks is None,
         )
     except AuthError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    if background_tasks is not None:
+        background_tasks.add_task(_deliver_magic_link, service, email.strip().lower(), magic_link)
+    return magic_link
+
+
+def _deliver_magic_link(service: AuthService, email: str, magic_link: str) -> None:
+    try:
+        service.send_magic_link_email(email, magic_link)
+    except AuthError:
+        pass  # already logged; the response has gone out and the user can request another link
 
 
 def finalize_login(response: Response, signed_token: str, db: Session) -> AuthContext:
@@ -71,20 +160,20 @@ def finalize_login(response: Response, signed_token: str, db: Session) -> AuthCo
 
 def attach_session_cookie(response: Response, raw_token: str) -> None:
     response.set_cookie(
-        key=settings.cookie_name,
+        key=_COOKIE_NAME,
         value=raw_token,
         httponly=True,
-        secure=settings.environment == "production",
+        secure=_COOKIE_SECURE,
         samesite="lax",
-        domain=settings.cookie_domain,
+        domain=_COOKIE_DOMAIN,
         path="/",
-        max_age=int(timedelta(hours=settings.session_ttl_hours).total_seconds()),
+        max_age=_COOKIE_MAX_AGE,
     )
 
 
 def clear_session_cookie(response: Response) -> None:
     response.delete_cookie(
-        key=settings.cookie_name,
-        domain=settings.cookie_domain,
+        key=_COOKIE_NAME,
+        domain=_COOKIE_DOMAIN,
         path="/",
     )
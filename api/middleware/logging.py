@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+import threading
 import time
 import uuid
 from typing import Callable
@@ -12,6 +14,34 @@ from starlette.responses import Response
 
 ACCESS_LOGGER_NAME = "compliance_copilot.access"
 
+# Built once; json.dumps would construct a fresh encoder for every non-default call.
+_encode_payload = json.JSONEncoder(separators=(",", ":"), check_circular=False).encode
+
+# Request ids are sliced from a buffered urandom block: one syscall per 256 ids instead of one each.
+_RANDOM_BLOCK_SIZE = 4096
+_random_block = b""
+_random_offset = 0
+_random_lock = threading.Lock()
+
+
+def _reset_random_block() -> None:
+    global _random_block, _random_offset
+    _random_block, _random_offset = b"", 0
+
+
+# Forked workers must not replay the parent's buffered bytes.
+os.register_at_fork(after_in_child=_reset_random_block)
+
+
+def _new_request_id() -> str:
+    global _random_block, _random_offset
+    with _random_lock:
+        if _random_offset + 16 > len(_random_block):
+            _random_block, _random_offset = os.urandom(_RANDOM_BLOCK_SIZE), 0
+        chunk = _random_block[_random_offset : _random_offset + 16]
+        _random_offset += 16
+    return str(uuid.UUID(bytes=chunk, version=4))
+
 
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
     """Emit structured access logs for every request."""
@@ -21,49 +51,44 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         self.logger = logger if logger is not None else logging.getLogger(ACCESS_LOGGER_NAME)
 
     async def dispatch(self, request: Request, call_next: Callable[[Request], Response]) -> Response:
-        request_id = request.headers.get("x-request-id", str(uuid.uuid4()))
+        request_id = request.headers.get("x-request-id") or _new_request_id()
         request.state.request_id = request_id
-        start = time.perf_counter()
+        start = time.monotonic_ns()
 
         try:
             response = await call_next(request)
         except Exception:
-            duration_ms = int((time.perf_counter() - start) * 1000)
-            error_payload = {
-                "event": "http_request_error",
-                "request_id": request_id,
-                "method": request.method,
-                "path": request.url.path,
-                "status": 500,
-                "duration_ms": duration_ms,
-            }
-            if getattr(request.state, "user_id", None):
-                error_payload["user_id"] = getattr(request.state, "user_id")
-            if getattr(request.state, "org_id", None):
-                error_payload["org_id"] = getattr(request.state, "org_id")
-
+            duration_ms = (time.monotonic_ns() - start) // 1_000_000
+            error_payload = self._payload(request, "http_request_error", request_id, 500, duration_ms)
             self._log(error_payload, level=logging.ERROR)
             raise
 
-        duration_ms = int((time.perf_counter() - start) * 1000)
+        duration_ms = (time.monotonic_ns() - start) // 1_000_000
         response.headers.setdefault("x-request-id", request_id)
 
-        payload = {
-            "event": "http_request",
+        self._log(self._payload(request, "http_request", request_id, response.status_code, duration_ms))
+
+        return response
+
+    @staticmethod
+    def _payload(
+        request: Request, event: str, request_id: str, status: int, duration_ms: int
+    ) -> dict[str, object]:
+        user_id = getattr(request.state, "user_id", None)
+        org_id = getattr(request.state, "org_id", None)
+        payload: dict[str, object] = {
+            "event": event,
             "request_id": request_id,
             "method": request.method,
             "path": request.url.path,
-            "status": response.status_code,
+            "status": status,
             "duration_ms": duration_ms,
         }
-        if getattr(request.state, "user_id", None):
-            payload["user_id"] = getattr(request.state, "user_id")
-        if getattr(request.state, "org_id", None):
-            payload["org_id"] = getattr(request.state, "org_id")
-
-        self._log(payload)
-
-        return response
+        if user_id:
+            payload["user_id"] = user_id
+        if org_id:
+            payload["org_id"] = org_id
+        return payload
 
     def _log(self, payload: dict[str, object], level: int = logging.INFO) -> None:
-        self.logger.log(level, json.dumps(payload, separators=(",", ":")))
+        self.logger.log(level, _encode_payload(payload))
@@ -1,3 +1,4 @@
+from .document_jobs import DocumentJob, DocumentJobStatusEnum
 from .documents import Document
 from .events import Event
 from .login_tokens import LoginToken
@@ -20,6 +21,8 @@ from .users import User
 
 __all__ = [
     "Document",
+    "DocumentJob",
+    "DocumentJobStatusEnum",
     "Event",
     "LoginToken",
     "Membership",
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from enum import Enum
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Enum as SAEnum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from ._ids import uuid7
+from .base import Base
+
+
+class DocumentJobStatusEnum(str, Enum):
+    PENDING = "PENDING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+
+class DocumentJob(Base):
+    __tablename__ = "document_jobs"
+    __table_args__ = (
+        Index(
+            "ix_document_jobs_pending_run_at",
+            "run_at",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    org_id = Column(
+        UUID(as_uuid=True), ForeignKey("orgs.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    document_id = Column(
+        UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
+    )
+    run_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    status = Column(
+        SAEnum(DocumentJobStatusEnum, name="document_job_status"),
+        nullable=False,
+        server_default=DocumentJobStatusEnum.PENDING.value,
+    )
+    attempts = Column(Integer, nullable=False, server_default=text("0"))
+    last_attempt_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(String, nullable=True)
+    payload = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+    # The unit of work only orders INSERTs across mappers along relationship() dependencies; the
+    # foreign key alone is not used. Without this, a job queued in the same flush as its new
+    # document is inserted first and violates document_jobs_document_id_fkey.
+    document = relationship("Document", lazy="raise")
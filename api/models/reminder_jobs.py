@@ -2,13 +2,12 @@ from __future__ import annotations
 
 from enum import Enum
 
-import uuid
-
 from sqlalchemy import (
     Column,
     DateTime,
     Enum as SAEnum,
     ForeignKey,
+    Index,
     Integer,
     String,
     UniqueConstraint,
@@ -17,6 +16,7 @@ from sqlalchemy import (
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.sql import func
 
+from ._ids import uuid7
 from .base import Base
 
 
@@ -37,9 +37,14 @@ class ReminderJob(Base):
             "target_due_at",
             name="uq_reminder_jobs_target_offset",
         ),
+        Index(
+            "ix_reminder_jobs_pending_run_at",
+            "run_at",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
     )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     org_id = Column(
         UUID(as_uuid=True), ForeignKey("orgs.id", ondelete="CASCADE"), nullable=False, index=True
     )
@@ -47,7 +52,7 @@ class ReminderJob(Base):
     target_id = Column(UUID(as_uuid=True), nullable=False)
     target_due_at = Column(DateTime(timezone=True), nullable=True)
     reminder_offset_days = Column(Integer, nullable=False)
-    run_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    run_at = Column(DateTime(timezone=True), nullable=False)
     recipient_email = Column(String, nullable=False)
     recipient_locale = Column(String, nullable=False, server_default="en")
     status = Column(
@@ -2,13 +2,16 @@ from enum import Enum
 from datetime import datetime, timezone
 import uuid
 
-from sqlalchemy import Column, DateTime, Enum as SAEnum, Float, ForeignKey, Integer, String, Text, text
+from sqlalchemy import Column, DateTime, Enum as SAEnum, Float, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
+from ._ids import uuid7
 from .base import Base
 
+UTC = timezone.utc
+
 
 class RequirementStatusEnum(str, Enum):
     OPEN = "OPEN"
@@ -42,11 +45,18 @@ class RequirementAnchorTypeEnum(str, Enum):
 
 class Requirement(Base):
     __tablename__ = "requirements"
+    __table_args__ = (
+        Index(
+            "ix_requirements_attributes_gin",
+            "attributes",
+            postgresql_using="gin",
+            postgresql_ops={"attributes": "jsonb_path_ops"},
+        ),
+        Index("ix_requirements_org_id_due_date", "org_id", "due_date"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    org_id = Column(
-        UUID(as_uuid=True), ForeignKey("orgs.id", ondelete="CASCADE"), nullable=False, index=True
-    )
+    org_id = Column(UUID(as_uuid=True), ForeignKey("orgs.id", ondelete="CASCADE"), nullable=False)
     document_id = Column(
         UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
     )
@@ -76,12 +86,15 @@ class Requirement(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
 
-    document = relationship("Document", back_populates="requirements", lazy="joined")
+    document = relationship("Document", back_populates="requirements", lazy="raise")
+    # Nothing reads the history collection off a Requirement, so it is never eager-loaded; the FK's
+    # ON DELETE CASCADE removes the rows without the ORM fetching them first.
     history_entries = relationship(
         "RequirementHistory",
         back_populates="requirement",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
     )
 
     def mark_complete(
@@ -94,8 +107,12 @@ class Requirement(Base):
     ) -> "RequirementHistory":
         from ..services.schedule import RecurrenceError, compute_next_due
 
-        timestamp = completed_at or datetime.now(timezone.utc)
-        timestamp = timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=timezone.utc)
+        if completed_at is None:
+            timestamp = datetime.now(UTC)
+        elif completed_at.tzinfo is None:
+            timestamp = completed_at.replace(tzinfo=UTC)
+        else:
+            timestamp = completed_at
 
         history = RequirementHistory(
             requirement=self,
@@ -104,17 +121,16 @@ class Requirement(Base):
             notes=notes,
             photo_count=photo_count or 0,
         )
-        self.history_entries.append(history)
 
-        anchor_value = dict(self.anchor_value or {})
+        # Only assign anchor_value when it actually changes; any assignment marks the JSONB column dirty.
+        anchor_value = self.anchor_value
         if (
             self.anchor_type == RequirementAnchorTypeEnum.FIRST_COMPLETION
-            and "date" not in anchor_value
+            and "date" not in (anchor_value or {})
         ):
-            anchor_value["date"] = timestamp.isoformat()
-            self.anchor_value = anchor_value
-        elif not anchor_value:
-            self.anchor_value = anchor_value
+            self.anchor_value = {**(anchor_value or {}), "date": timestamp.isoformat()}
+        elif anchor_value is None:
+            self.anchor_value = {}
 
         try:
             next_due = compute_next_due(
@@ -147,7 +163,7 @@ class Requirement(Base):
 class RequirementHistory(Base):
     __tablename__ = "requirement_history"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     requirement_id = Column(
         UUID(as_uuid=True),
         ForeignKey("requirements.id", ondelete="CASCADE"),
@@ -159,4 +175,4 @@ class RequirementHistory(Base):
     notes = Column(Text, nullable=True)
     photo_count = Column(Integer, nullable=False, server_default=text("0"))
 
-    requirement = relationship("Requirement", back_populates="history_entries", lazy="joined")
+    requirement = relationship("Requirement", back_populates="history_entries", lazy="raise")
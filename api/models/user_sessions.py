@@ -1,11 +1,10 @@
 from __future__ import annotations
 
-import uuid
-
-from sqlalchemy import Column, DateTime, ForeignKey, String, UniqueConstraint
+from sqlalchemy import Column, DateTime, ForeignKey, LargeBinary, String, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 
+from ._ids import uuid7
 from .base import Base
 
 
@@ -15,10 +14,10 @@ class UserSession(Base):
         UniqueConstraint("session_token_hash", name="uq_user_sessions_token"),
     )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     org_id = Column(UUID(as_uuid=True), ForeignKey("orgs.id", ondelete="CASCADE"), nullable=False)
-    session_token_hash = Column(String, nullable=False)
+    session_token_hash = Column(LargeBinary(32), nullable=False)  # raw SHA-256 digest
     user_agent = Column(String, nullable=True)
     ip_address = Column(String, nullable=True)
     expires_at = Column(DateTime(timezone=True), nullable=False)
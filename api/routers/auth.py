@@ -1,32 +1,49 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Request, Response
-from pydantic import BaseModel, EmailStr, Field
+from typing import Annotated
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Request, Response
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, StringConstraints
 from sqlalchemy.orm import Session
 
 from ..config import settings
-from ..dependencies.auth import AuthContext, clear_session_cookie, finalize_login, issue_magic_link, require_auth
+from ..dependencies.auth import (
+    AuthContext,
+    clear_session_cookie,
+    finalize_login,
+    forget_cached_session,
+    issue_magic_link,
+    require_auth,
+)
 from ..dependencies.db import get_db
 from ..models import Org, User
 from ..services.auth import AuthService
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+Locale = Annotated[str, StringConstraints(pattern=r"^[a-z]{2}(-[A-Z]{2})?$")]
+
 
 class MagicLinkRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     email: EmailStr
-    preferred_locale: str = Field(default="en", pattern="^[a-z]{2}(-[A-Z]{2})?$")
+    preferred_locale: Locale = "en"
     redirect_path: str | None = Field(default="/dashboard")
 
 
+# Outbound only: handlers build it with model_construct from server-side data, and FastAPI validates
+# it once more against the response model anyway.
 class SessionPayload(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     user: dict
     org: dict
     redirect_path: str | None = None
 
 
 class UpdateProfileRequest(BaseModel):
-    preferred_locale: str = Field(..., pattern="^[a-z]{2}(-[A-Z]{2})?$")
+    preferred_locale: Locale
 
 
 def _serialize_user(user: User) -> dict:
@@ -49,8 +66,13 @@ def _serialize_org(org: Org) -> dict:
 
 
 @router.post("/magic-link")
-def send_magic_link(payload: MagicLinkRequest, request: Request, db: Session = Depends(get_db)) -> dict:
-    issue_magic_link(payload.email, payload.preferred_locale, request, db, payload.redirect_path)
+def send_magic_link(
+    payload: MagicLinkRequest,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+) -> dict:
+    issue_magic_link(payload.email, payload.preferred_locale, request, db, payload.redirect_path, background_tasks)
     return {"status": "sent"}
 
 
@@ -58,12 +80,14 @@ def send_magic_link(payload: MagicLinkRequest, request: Request, db: Session = D
 def magic_link_callback(token: str, response: Response, db: Session = Depends(get_db)) -> SessionPayload:
     context = finalize_login(response, token, db)
     redirect_path = response.headers.get("x-redirect-path", "/dashboard")
-    return SessionPayload(user=_serialize_user(context.user), org=_serialize_org(context.org), redirect_path=redirect_path)
+    return SessionPayload.model_construct(
+        user=_serialize_user(context.user), org=_serialize_org(context.org), redirect_path=redirect_path
+    )
 
 
 @router.get("/me")
 def get_current_user(context: AuthContext = Depends(require_auth)) -> SessionPayload:
-    return SessionPayload(
+    return SessionPayload.model_construct(
         user=_serialize_user(context.user),
         org=_serialize_org(context.org),
         redirect_path=None,
@@ -80,7 +104,8 @@ def update_current_user(
     db.add(context.user)
     db.commit()
     db.refresh(context.user)
-    return SessionPayload(
+    forget_cached_session(context.session.session_token_hash)
+    return SessionPayload.model_construct(
         user=_serialize_user(context.user),
         org=_serialize_org(context.org),
         redirect_path=None,
@@ -96,5 +121,6 @@ def logout_user(
     raw_token = request.cookies.get(settings.cookie_name)
     if raw_token:
         AuthService(db).revoke_session(raw_token)
+        forget_cached_session(AuthService.hash_token(raw_token))
     clear_session_cookie(response)
     return {"status": "logged_out"}
@@ -5,12 +5,18 @@ import io
 import logging
 import os
 import re
+import tempfile
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import lru_cache
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, BinaryIO, Dict, Optional
 
-from fastapi import APIRouter, BackgroundTasks, Body, Depends, File, Form, HTTPException, Query, UploadFile
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, File, Form, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.routing import APIRoute
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
@@ -18,6 +24,7 @@ from ..dependencies.auth import AuthContext, require_auth
 from ..dependencies.db import get_db
 from ..db.session import SessionLocal
 from ..config import settings
+from ..models.document_jobs import DocumentJob
 from ..models.documents import Document
 from ..models.events import Event
 from ..models.requirements import (
@@ -28,7 +35,13 @@ from ..models.requirements import (
 )
 from ..models.permits import Permit
 from ..models.training_certs import TrainingCert
-from ..services.classify import classify_document, get_override_for_hash, record_override_event
+from ..services.classify import (
+    ClassificationResult,
+    classify_document,
+    get_override_for_hash,
+    record_override_event,
+)
+from ..services.document_jobs import enqueue_document_job
 from ..services.extraction_pipeline import attach_translations, extract_requirement_drafts
 from ..services.metrics import record_requirements_created
 from ..services.parse_pdf import extract_text_from_pdf
@@ -42,15 +55,52 @@ from ..services.storage import get_storage_service
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
-
 MAX_UPLOAD_BYTES = 20 * 1024 * 1024
+# Room for the multipart boundaries and form fields around a file of exactly MAX_UPLOAD_BYTES.
+_MULTIPART_OVERHEAD_BYTES = 64 * 1024
+# Extracted text shorter than this is treated as an empty or scanned PDF.
+MIN_CONTENT_CHARS = 200
+
+
+class _ContentLengthLimitedRoute(APIRoute):
+    """Reject bodies whose declared size is over the upload limit before FastAPI reads the form.
+
+    Form parsing drains and spools the whole body before the endpoint runs, so the size check in
+    the upload loop alone would still accept up to the full body first. Chunked requests without a
+    Content-Length fall through to that check.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def limited_handler(request: Request) -> Response:
+            content_length = request.headers.get("content-length")
+            if (
+                content_length
+                and content_length.isdigit()
+                and int(content_length) > MAX_UPLOAD_BYTES + _MULTIPART_OVERHEAD_BYTES
+            ):
+                raise HTTPException(status_code=413, detail="File too large.")
+            return await handler(request)
+
+        return limited_handler
+
+
+router = APIRouter(route_class=_ContentLengthLimitedRoute)
 
 DocumentStatus = str
 
 
 class DocumentProcessingError(Exception):
-    """Raised when background processing fails in a recoverable way."""
+    """Raised when background processing fails in a recoverable way.
+
+    ``retryable`` tells the document worker whether running the job again could succeed; most of
+    these failures (unreadable or near-empty PDFs, bad job payloads) cannot, so they fail at once.
+    """
+
+    def __init__(self, message: str, *, retryable: bool = False) -> None:
+        super().__init__(message)
+        self.retryable = retryable
 
 
 def _storage_key_from_url(storage_url: str | None) -> str | None:
@@ -77,17 +127,94 @@ def _storage_key_from_url(storage_url: str | None) -> str | None:
     return storage_url
 
 
+class _SharedFileReader(io.RawIOBase):
+    """Read-only view of a seekable file with its own position.
+
+    Several views over one file can be read from different threads; each read re-seeks the shared
+    file under the lock, so the S3 upload and the PDF parser can consume the same spooled upload
+    concurrently without copying it.
+    """
+
+    def __init__(self, file: BinaryIO, lock: threading.Lock) -> None:
+        self._file = file
+        self._lock = lock
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int | None = -1) -> bytes:
+        with self._lock:
+            self._file.seek(self._pos)
+            data = self._file.read(-1 if size is None else size)
+        self._pos += len(data)
+        return data
+
+    def readall(self) -> bytes:
+        return self.read()
+
+    def readinto(self, buffer) -> int:
+        with self._lock:
+            self._file.seek(self._pos)
+            count = self._file.readinto(buffer)
+        self._pos += count
+        return count
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            with self._lock:
+                offset += self._file.seek(0, io.SEEK_END)
+        elif whence != io.SEEK_SET:
+            raise ValueError(f"Invalid whence: {whence}")
+        if offset < 0:
+            raise ValueError("Negative seek position")
+        self._pos = offset
+        return offset
+
+    def tell(self) -> int:
+        return self._pos
+
+
+# Sync handlers run on AnyIO's default threadpool, which allows 40 threads.
+_REQUEST_THREADS = 40
+# S3 PUTs for uploads run here while the request thread parses the PDF. One worker per request
+# thread (or S3 connection, if more) so concurrent uploads never queue behind each other here.
+_UPLOAD_EXECUTOR = ThreadPoolExecutor(
+    max_workers=max(_REQUEST_THREADS, settings.aws.max_pool_connections),
+    thread_name_prefix="document-upload",
+)
+
+
+_UNSAFE_FILENAME_RX = re.compile(r"[^A-Za-z0-9._-]")
+# ASCII-only names (the common case) are rewritten with a translate table instead of the regex.
+_UNSAFE_FILENAME_TABLE = {code: "_" for code in range(128) if not (chr(code).isalnum() or chr(code) in "._-")}
+
+
 def sanitize_filename(filename: str) -> str:
     name = os.path.basename(filename or "document.pdf")
-    name = re.sub(r"[^A-Za-z0-9._-]", "_", name)
+    if name.isascii():
+        name = name.translate(_UNSAFE_FILENAME_TABLE)
+    else:
+        name = _UNSAFE_FILENAME_RX.sub("_", name)
     return name[:100] or "document.pdf"
 
 
+_ISO_DATE_RX = re.compile(r"\d{4}-\d{2}-\d{2}", re.ASCII)
+
+
 def parse_due_date(value: str | None) -> datetime | None:
     if not value:
         return None
     try:
-        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        # Drafts almost always carry a bare YYYY-MM-DD date; build it directly.
+        if _ISO_DATE_RX.fullmatch(value):
+            return datetime(int(value[:4]), int(value[5:7]), int(value[8:]), tzinfo=timezone.utc)
+        parsed = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
         if parsed.tzinfo is None:
             parsed = parsed.replace(tzinfo=timezone.utc)
         return parsed
@@ -97,63 +224,107 @@ def parse_due_date(value: str | None) -> datetime | None:
 
 _GENERIC_DATE_PATTERN = r"(\d{4}[\-/]\d{1,2}[\-/]\d{1,2}|\d{1,2}[\-/]\d{1,2}[\-/]\d{2,4})"
 
-_PERMIT_ISSUE_PATTERNS = (
-    re.compile(rf"(?:issued|issue date|date issued|effective(?: date)?)[:\s,-]*{_GENERIC_DATE_PATTERN}", re.IGNORECASE),
-    re.compile(rf"(?:start date|approval date|authorized on)[:\s,-]*{_GENERIC_DATE_PATTERN}", re.IGNORECASE),
-)
 
-_PERMIT_EXPIRY_PATTERNS = (
-    re.compile(rf"(?:expires|expiration(?: date)?|expiry(?: date)?|valid until|valid thru|valid through)[:\s,-]*{_GENERIC_DATE_PATTERN}", re.IGNORECASE),
-    re.compile(rf"(?:good thru|good through|expires on)[:\s,-]*{_GENERIC_DATE_PATTERN}", re.IGNORECASE),
+_PERMIT_ISSUE_LABELS = (
+    r"issued|issue date|date issued|effective(?: date)?",
+    r"start date|approval date|authorized on",
 )
-
-_TRAINING_ISSUE_PATTERNS = (
-    re.compile(rf"(?:completed on|completion date|issued(?: on)?|training date)[:\s,-]*{_GENERIC_DATE_PATTERN}", re.IGNORECASE),
+_EXPIRY_LABELS = (
+    r"expires|expiration(?: date)?|expiry(?: date)?|valid until|valid thru|valid through",
+    r"good thru|good through|expires on",
 )
+_TRAINING_ISSUE_LABELS = (r"completed on|completion date|issued(?: on)?|training date",)
+
+
+def _combine_date_patterns(*slots: tuple[str, ...]) -> re.Pattern[str]:
+    """One regex per document kind covering all of its date slots.
+
+    Each label alternation becomes a named group ``s{slot}_{rank}``. Issue and expiry labels never
+    match overlapping text, so one scan finds the same candidates as a scan per slot.
+    """
+    return re.compile(
+        "|".join(
+            rf"(?P<s{slot}_{rank}>(?:{label})[:\s,-]*{_GENERIC_DATE_PATTERN})"
+            for slot, labels in enumerate(slots)
+            for rank, label in enumerate(labels)
+        ),
+        re.IGNORECASE,
+    )
+
+
+_PERMIT_DATE_PATTERNS = _combine_date_patterns(_PERMIT_ISSUE_LABELS, _EXPIRY_LABELS)
+_TRAINING_DATE_PATTERNS = _combine_date_patterns(_TRAINING_ISSUE_LABELS, _EXPIRY_LABELS)
+
+
+_GENERIC_DATE_RX = re.compile(_GENERIC_DATE_PATTERN)
 
 
 def _parse_fuzzy_date(value: str | None) -> datetime | None:
     if not value:
         return None
-    token = value.strip()
-    match = re.search(_GENERIC_DATE_PATTERN, token)
+    match = _GENERIC_DATE_RX.search(value.strip())
     if not match:
         return None
-    token = match.group(0)
-    token = token.replace(".", "/").replace(" ", "")
-    for fmt in ("%m/%d/%Y", "%m/%d/%y", "%Y-%m-%d", "%Y/%m/%d"):
-        try:
-            parsed = datetime.strptime(token, fmt)
-            if "%y" in fmt and parsed.year < 2000:
-                parsed = parsed.replace(year=parsed.year + 2000)
-            parsed = parsed.replace(hour=12, minute=0, second=0, microsecond=0)
-            return parsed.replace(tzinfo=timezone.utc)
-        except ValueError:
-            continue
-    return None
+    return _date_from_token(match.group(0))
+
+
+# Date tokens repeat heavily within a document and across template batches; datetimes are
+# immutable, so parsed results can be shared.
+@lru_cache(maxsize=8192)
+def _date_from_token(token: str) -> datetime | None:
+    # The regex guarantees digit runs, so the layouts once tried with strptime (m/d/Y, m/d/y,
+    # Y-m-d, Y/m/d) are told apart by separator and field width and parsed with int().
+    separator = "/" if "/" in token else "-"
+    parts = token.split(separator)
+    if len(parts) != 3:
+        return None
+    first, second, third = (int(part) for part in parts)
+    if len(parts[0]) == 4:
+        year, month, day = first, second, third
+    elif separator == "/" and len(parts[2]) == 4:
+        month, day, year = first, second, third
+    elif separator == "/" and len(parts[2]) == 2:
+        month, day = first, second
+        # strptime's %y pivot (69-99 -> 19xx), then the old "< 2000 -> +2000" adjustment on top.
+        year = third + 2000 if third < 69 else third + 3900
+    else:
+        return None
+    try:
+        return datetime(year, month, day, 12, tzinfo=timezone.utc)
+    except ValueError:
+        return None
 
 
-def _extract_date_from_patterns(text: str, patterns: Tuple[re.Pattern[str], ...]) -> datetime | None:
-    for pattern in patterns:
-        match = pattern.search(text)
-        if match:
-            token = match.group(0)
-            parsed = _parse_fuzzy_date(token)
-            if parsed:
-                return parsed
-    return None
+def _extract_slot_dates(text: str, patterns: re.Pattern[str]) -> tuple[datetime | None, datetime | None]:
+    # Single pass over the text for both slots. Within a slot, lower-ranked labels still win over
+    # higher ones wherever they appear, and only the first hit of each label is tried, as when each
+    # label was searched alone.
+    best_rank: list[int | None] = [None, None]
+    best: list[datetime | None] = [None, None]
+    tried: set[str] = set()
+    settled = 0
+    for match in patterns.finditer(text):
+        group = match.lastgroup
+        slot, rank = int(group[1]), int(group[3:])
+        if group in tried or (best_rank[slot] is not None and rank >= best_rank[slot]):
+            continue
+        tried.add(group)
+        parsed = _parse_fuzzy_date(match.group(0))
+        if parsed:
+            best_rank[slot], best[slot] = rank, parsed
+            if rank == 0:
+                settled += 1
+                if settled == 2:
+                    break
+    return best[0], best[1]
 
 
 def _extract_permit_dates(text: str) -> tuple[datetime | None, datetime | None]:
-    issued = _extract_date_from_patterns(text, _PERMIT_ISSUE_PATTERNS)
-    expires = _extract_date_from_patterns(text, _PERMIT_EXPIRY_PATTERNS)
-    return issued, expires
+    return _extract_slot_dates(text, _PERMIT_DATE_PATTERNS)
 
 
 def _extract_training_dates(text: str) -> tuple[datetime | None, datetime | None]:
-    issued = _extract_date_from_patterns(text, _TRAINING_ISSUE_PATTERNS)
-    expires = _extract_date_from_patterns(text, _PERMIT_EXPIRY_PATTERNS)
-    return issued, expires
+    return _extract_slot_dates(text, _TRAINING_DATE_PATTERNS)
 
 
 def _serialize_document(
@@ -163,51 +334,62 @@ def _serialize_document(
     download_url: Optional[str],
     classification: Optional[Dict[str, Any]],
 ) -> Dict[str, Any]:
+    # Datetimes are left as-is: the document endpoints return ORJSONResponse directly, which encodes
+    # them natively (ISO 8601, same as isoformat()) without a jsonable_encoder pass over every row.
     return {
         "id": str(document.id),
         "name": document.name,
         "storage_url": document.storage_url,
         "download_url": download_url,
         "download_path": f"/documents/{document.id}/download",
-        "created_at": document.created_at.isoformat() if document.created_at else None,
-        "extracted_at": document.extracted_at.isoformat() if document.extracted_at else None,
+        "created_at": document.created_at,
+        "extracted_at": document.extracted_at,
         "requirement_count": int(requirement_count or 0),
         "status": status,
         "classification": classification,
     }
 
 
-def _document_status(db: Session, document: Document) -> DocumentStatus:
+_STATUS_EVENT_TYPES = ("extraction_failed", "classified")
+
+
+def _latest_status_events(db: Session, document_ids: list[uuid.UUID]) -> Dict[tuple[uuid.UUID, str], Any]:
+    """Data of the newest status-bearing event of each type per document, in a single query."""
+    if not document_ids:
+        return {}
+    rows = (
+        db.query(Event.document_id, Event.type, Event.data)
+        .filter(Event.document_id.in_(document_ids), Event.type.in_(_STATUS_EVENT_TYPES))
+        .distinct(Event.document_id, Event.type)
+        .order_by(Event.document_id, Event.type, Event.at.desc())
+        .all()
+    )
+    return {(document_id, event_type): data for document_id, event_type, data in rows}
+
+
+def _document_status(document: Document, latest_events: Dict[tuple[uuid.UUID, str], Any]) -> DocumentStatus:
     if document.extracted_at:
         return "READY"
-    failure_event = (
-        db.query(Event)
-        .filter(Event.document_id == document.id, Event.type == "extraction_failed")
-        .order_by(Event.at.desc())
-        .first()
-    )
-    if failure_event:
+    if (document.id, "extraction_failed") in latest_events:
         return "FAILED"
     return "PROCESSING"
 
 
-def _document_classification(db: Session, document: Document) -> Optional[Dict[str, Any]]:
-    event = (
-        db.query(Event)
-        .filter(Event.document_id == document.id, Event.type == "classified")
-        .order_by(Event.at.desc())
-        .first()
-    )
-    if not event or not isinstance(event.data, dict):
+def _document_classification(
+    document: Document,
+    latest_events: Dict[tuple[uuid.UUID, str], Any],
+) -> Optional[Dict[str, Any]]:
+    data = latest_events.get((document.id, "classified"))
+    if not isinstance(data, dict):
         return None
-    label = event.data.get("label")
-    confidence = event.data.get("confidence")
+    label = data.get("label")
+    confidence = data.get("confidence")
     if not isinstance(label, str):
         return None
     return {
         "label": label,
         "confidence": float(confidence) if isinstance(confidence, (int, float)) else None,
-        "source": event.data.get("source", "auto"),
+        "source": data.get("source", "auto"),
     }
 
 
@@ -244,39 +426,65 @@ def upload_and_extract(
         raise HTTPException(status_code=400, detail="PDF only.")
 
     sanitized_name = sanitize_filename(file.filename)
-    total_bytes = 0
 
-    buffer = io.BytesIO()
-
-    try:
-        while True:
-            chunk = file.file.read(1024 * 1024)
-            if not chunk:
-                break
-            total_bytes += len(chunk)
-            if total_bytes > MAX_UPLOAD_BYTES:
-                raise HTTPException(status_code=400, detail="File too large.")
-            buffer.write(chunk)
-    finally:
-        file.file.close()
-
-    pdf_bytes = buffer.getvalue()
-    if not pdf_bytes:
+    # The multipart parser already spooled the upload (memory, then disk), so size-check and
+    # hash it in place and let storage and the PDF parser read that file rather than copying
+    # it into an in-memory buffer. FastAPI closes it after the response.
+    upload = file.file
+    total_bytes = upload.seek(0, io.SEEK_END)
+    if total_bytes > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=400, detail="File too large.")
+    if total_bytes == 0:
         raise HTTPException(status_code=400, detail="Empty file")
 
-    file_hash = hashlib.sha256(pdf_bytes).hexdigest()
+    upload.seek(0)
+    file_hash = hashlib.file_digest(upload, "sha256").hexdigest()
 
+    # The S3 PUT mostly waits on the network while parsing is CPU-bound, so overlap the two;
+    # each reads the spooled upload through its own cursor.
     storage = get_storage_service()
-    stored_file = storage.upload_fileobj(
+    upload_lock = threading.Lock()
+    upload_future = _UPLOAD_EXECUTOR.submit(
+        storage.upload_fileobj,
         org_uuid,
-        io.BytesIO(pdf_bytes),
+        _SharedFileReader(upload, upload_lock),
         filename=sanitized_name,
         content_type=file.content_type or "application/pdf",
     )
+    # Queued uploads are re-extracted by the worker, so here only enough text to validate is needed.
+    queued = settings.document_processing_mode == "queue"
+    validation_error: Exception | None = None
+    try:
+        validation_text = extract_text_from_pdf(
+            _SharedFileReader(upload, upload_lock),
+            max_chars=MIN_CONTENT_CHARS if queued else None,
+        )
+    except Exception as exc:
+        validation_text = None
+        validation_error = exc
+    stored_file = upload_future.result()
+
+    if validation_error is not None:
+        try:
+            storage.delete(stored_file.key)
+        except Exception:  # pragma: no cover
+            logger.warning("Failed to delete stored file after validation error", exc_info=True)
+        if isinstance(validation_error, HTTPException):
+            raise validation_error
+        logger.error("PDF validation failed", exc_info=validation_error)  # pragma: no cover - defensive
+        raise HTTPException(status_code=500, detail="Extraction failed.") from validation_error
 
-    doc = Document(org_id=org_uuid, name=sanitized_name, storage_url=stored_file.storage_url)
+    if not validation_text or len(validation_text) < MIN_CONTENT_CHARS:
+        try:
+            storage.delete(stored_file.key)
+        except Exception:  # pragma: no cover
+            logger.warning("Failed to delete stored file after short PDF", exc_info=True)
+        raise HTTPException(status_code=400, detail="Not enough content.")
+
+    # Assign the id client-side so the upload event can reference it without a flush; both rows
+    # are written together at commit.
+    doc = Document(id=uuid.uuid4(), org_id=org_uuid, name=sanitized_name, storage_url=stored_file.storage_url)
     db.add(doc)
-    db.flush()
 
     db.add(
         Event(
@@ -291,47 +499,33 @@ def upload_and_extract(
             },
         )
     )
-    db.flush()
-
-    try:
-        validation_text = extract_text_from_pdf(io.BytesIO(pdf_bytes))
-    except HTTPException:
-        db.rollback()
-        try:
-            storage.delete(stored_file.key)
-        except Exception:  # pragma: no cover
-            logger.warning("Failed to delete stored file after validation error", exc_info=True)
-        raise
-    except Exception as exc:  # pragma: no cover - defensive
-        db.rollback()
-        try:
-            storage.delete(stored_file.key)
-        except Exception:  # pragma: no cover
-            logger.warning("Failed to delete stored file after exception", exc_info=True)
-        logger.exception("PDF validation failed")
-        raise HTTPException(status_code=500, detail="Extraction failed.") from exc
-
-    if not validation_text or len(validation_text) < 200:
-        db.rollback()
-        try:
-            storage.delete(stored_file.key)
-        except Exception:  # pragma: no cover
-            logger.warning("Failed to delete stored file after short PDF", exc_info=True)
-        raise HTTPException(status_code=400, detail="Not enough content.")
 
+    if queued:
+        # Committed together with the document; the worker re-reads the PDF from storage.
+        enqueue_document_job(
+            db,
+            org_id=org_uuid,
+            document_id=doc.id,
+            payload={
+                "trade": trade.lower(),
+                "filename": sanitized_name,
+                "storage_key": stored_file.key,
+                "file_hash": file_hash,
+            },
+        )
     db.commit()
 
-    background_tasks.add_task(
-        _process_document_background,
-        str(doc.id),
-        str(org_uuid),
-        trade.lower(),
-        sanitized_name,
-        pdf_bytes,
-        stored_file.key,
-        file_hash,
-        validation_text,
-    )
+    if not queued:
+        background_tasks.add_task(
+            _process_document_background,
+            str(doc.id),
+            str(org_uuid),
+            trade.lower(),
+            sanitized_name,
+            stored_file.key,
+            file_hash,
+            validation_text,
+        )
 
     return {"id": str(doc.id), "status": "PROCESSING"}
 
@@ -367,24 +561,26 @@ def list_documents(
         .all()
     )
 
+    latest_events = _latest_status_events(db, [document.id for document, _ in rows])
     items: list[Dict[str, Any]] = []
     for document, requirement_count in rows:
-        storage_key = _storage_key_from_url(document.storage_url)
-        status = _document_status(db, document)
-        classification = _document_classification(db, document)
+        status = _document_status(document, latest_events)
+        classification = _document_classification(document, latest_events)
         items.append(
             _serialize_document(document, requirement_count, status, None, classification)
         )
 
-    return {
-        "items": items,
-        "pagination": {
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "pages": (total + limit - 1) // limit if total else 0,
-        },
-    }
+    return ORJSONResponse(
+        {
+            "items": items,
+            "pagination": {
+                "page": page,
+                "limit": limit,
+                "total": total,
+                "pages": (total + limit - 1) // limit if total else 0,
+            },
+        }
+    )
 
 
 @router.get("/documents/{doc_id}")
@@ -413,9 +609,10 @@ def get_document(
         or 0
     )
 
-    status = _document_status(db, document)
-    classification = _document_classification(db, document)
-    return _serialize_document(document, requirement_count, status, None, classification)
+    latest_events = _latest_status_events(db, [document.id])
+    status = _document_status(document, latest_events)
+    classification = _document_classification(document, latest_events)
+    return ORJSONResponse(_serialize_document(document, requirement_count, status, None, classification))
 
 
 @router.post("/documents/{doc_id}/move")
@@ -479,9 +676,10 @@ def move_document(
         or 0
     )
 
-    status = _document_status(db, document)
-    classification = _document_classification(db, document)
-    return _serialize_document(document, requirement_count, status, None, classification)
+    latest_events = _latest_status_events(db, [document.id])
+    status = _document_status(document, latest_events)
+    classification = _document_classification(document, latest_events)
+    return ORJSONResponse(_serialize_document(document, requirement_count, status, None, classification))
 
 
 @router.get("/documents/{doc_id}/download")
@@ -536,18 +734,31 @@ def download_document(
 
     storage = get_storage_service()
 
+    # Probe fallback keys with HEAD so only the key that exists is opened for streaming.
+    selected_key: str | None = candidate_keys[0]
     last_error: RuntimeError | None = None
-    for candidate in candidate_keys:
+    if len(candidate_keys) > 1:
+        selected_key = None
+        for candidate in candidate_keys:
+            try:
+                if storage.head(candidate) is not None:
+                    selected_key = candidate
+                    break
+            except RuntimeError as exc:
+                last_error = exc
+
+    metadata: dict | None = None
+    if selected_key is not None:
         try:
-            iterator, metadata, closer = storage.open_stream(candidate)
-            break
+            iterator, metadata, closer = storage.open_stream(selected_key)
         except RuntimeError as exc:
             last_error = exc
-    else:
+
+    if metadata is None:
         logger.warning(
             "Failed to stream document", extra={"document_id": document.id, "storage_url": document.storage_url}, exc_info=True
         )
-        status = 404 if last_error and "NoSuchKey" in str(last_error) else 500
+        status = 500 if last_error and "NoSuchKey" not in str(last_error) else 404
         detail = (
             "Document not found. Expected keys: " + ", ".join(candidate_keys)
             if status == 404
@@ -641,34 +852,34 @@ def _ensure_training_record(
     return cert
 
 
-def _process_document_background(
-    document_id: str,
-    org_id: str,
+def _process_document(
+    document_uuid: uuid.UUID,
+    org_uuid: uuid.UUID,
     trade: str,
     filename: str,
-    pdf_bytes: bytes,
     storage_key: str,
     file_hash: str,
-    initial_text: str | None = None,
+    text: str,
 ) -> None:
-    try:
-        document_uuid = uuid.UUID(document_id)
-        org_uuid = uuid.UUID(org_id)
-    except ValueError:
-        logger.exception("Invalid UUID for document processing", extra={"document_id": document_id, "org_id": org_id})
-        return
-
+    """Run the pipeline for one document and commit it; failures are rolled back and re-raised."""
     db = SessionLocal()
-    storage = get_storage_service()
     try:
+        # Held until the pipeline commits: a second run of the same job (e.g. after its claim
+        # lease lapsed mid-run) waits here and then sees extracted_at instead of racing this one.
         document = (
             db.query(Document)
             .filter(Document.id == document_uuid, Document.org_id == org_uuid)
+            .with_for_update()
             .one_or_none()
         )
         if document is None:
             logger.warning("Document not found for processing", extra={"document_id": document_uuid})
             return
+        if document.extracted_at is not None:
+            # A queued job can be re-run after its pipeline committed (e.g. the worker died before
+            # recording the job as done); don't create the requirements a second time.
+            logger.info("Document already processed", extra={"document_id": document_uuid})
+            return
 
         try:
             _run_document_pipeline(
@@ -677,33 +888,145 @@ def _process_document_background(
                 org_uuid,
                 trade,
                 filename,
-                pdf_bytes,
                 storage_key,
                 file_hash,
-                initial_text,
+                text,
             )
             db.commit()
-        except DocumentProcessingError as exc:
-            db.rollback()
-            logger.warning("Document processing failed", extra={"document_id": document_uuid, "reason": str(exc)})
-            _mark_document_failed(db, document, org_uuid, storage_key, str(exc))
-            db.commit()
-            try:
-                storage.delete(storage_key)
-            except Exception:  # pragma: no cover - best effort cleanup
-                logger.warning("Failed to delete stored file after processing error", exc_info=True)
-        except Exception as exc:  # pragma: no cover - unexpected failure
+        except Exception:
             db.rollback()
-            logger.exception("Unexpected document processing failure")
-            _mark_document_failed(db, document, org_uuid, storage_key, "Unexpected failure")
+            raise
+    finally:
+        db.close()
+
+
+def _fail_document(document_uuid: uuid.UUID, org_uuid: uuid.UUID, storage_key: str, reason: str) -> None:
+    db = SessionLocal()
+    try:
+        document = (
+            db.query(Document)
+            .filter(Document.id == document_uuid, Document.org_id == org_uuid)
+            .one_or_none()
+        )
+        if document is not None:
+            _mark_document_failed(db, document, org_uuid, storage_key, reason)
             db.commit()
-            try:
-                storage.delete(storage_key)
-            except Exception:  # pragma: no cover
-                logger.warning("Failed to delete stored file after unexpected error", exc_info=True)
     finally:
         db.close()
 
+    if not storage_key:
+        return
+    try:
+        get_storage_service().delete(storage_key)
+    except Exception:  # pragma: no cover - best effort cleanup
+        logger.warning("Failed to delete stored file after processing error", exc_info=True)
+
+
+def _failure_reason(exc: Exception) -> str:
+    return str(exc) if isinstance(exc, DocumentProcessingError) else "Unexpected failure"
+
+
+def _process_document_background(
+    document_id: str,
+    org_id: str,
+    trade: str,
+    filename: str,
+    storage_key: str,
+    file_hash: str,
+    text: str,
+) -> None:
+    # Only the text extracted during upload validation is carried over; the PDF bytes are not kept
+    # alive for the lifetime of the task or parsed a second time.
+    try:
+        document_uuid = uuid.UUID(document_id)
+        org_uuid = uuid.UUID(org_id)
+    except ValueError:
+        logger.exception("Invalid UUID for document processing", extra={"document_id": document_id, "org_id": org_id})
+        return
+
+    try:
+        _process_document(document_uuid, org_uuid, trade, filename, storage_key, file_hash, text)
+    except DocumentProcessingError as exc:
+        logger.warning("Document processing failed", extra={"document_id": document_uuid, "reason": str(exc)})
+        _fail_document(document_uuid, org_uuid, storage_key, _failure_reason(exc))
+    except Exception as exc:  # pragma: no cover - unexpected failure
+        logger.exception("Unexpected document processing failure")
+        _fail_document(document_uuid, org_uuid, storage_key, _failure_reason(exc))
+
+
+def process_document_job(job: DocumentJob) -> None:
+    """Run the pipeline for a queued upload, re-reading the PDF from storage in the worker.
+
+    Errors propagate so the dispatcher can retry the job; the document is only marked failed (and
+    its PDF deleted) by ``fail_document_job`` once the job runs out of attempts.
+    """
+    payload = job.payload or {}
+    storage_key = payload.get("storage_key")
+    file_hash = payload.get("file_hash")
+    if not storage_key or not file_hash:
+        # The file hash keys the classification cache; an empty one would share results across files.
+        raise DocumentProcessingError("Document job payload is missing storage_key or file_hash.")
+
+    with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as spool:
+        get_storage_service().download_fileobj(storage_key, spool)
+        text = extract_text_from_pdf(spool)
+
+    _process_document(
+        job.document_id,
+        job.org_id,
+        payload.get("trade", "electrical"),
+        payload.get("filename", "document.pdf"),
+        storage_key,
+        file_hash,
+        text or "",
+    )
+
+
+def fail_document_job(job: DocumentJob, exc: Exception) -> None:
+    """Mark a queued document failed after its job exhausted its retries."""
+    storage_key = (job.payload or {}).get("storage_key") or ""
+    _fail_document(job.document_id, job.org_id, storage_key, _failure_reason(exc))
+
+
+# Draft enums arrive as canonical or lower-case strings; resolve both with one dict lookup instead
+# of constructing the enum and retrying upper-cased after a ValueError.
+_FREQUENCY_BY_VALUE = {
+    **{member.value: member for member in RequirementFrequencyEnum},
+    **{member.value.lower(): member for member in RequirementFrequencyEnum},
+}
+_ANCHOR_TYPE_BY_VALUE = {
+    **{member.value: member for member in RequirementAnchorTypeEnum},
+    **{member.value.lower(): member for member in RequirementAnchorTypeEnum},
+}
+
+
+def _lookup_enum(lookup: Dict[str, Any], value: str) -> Any:
+    member = lookup.get(value) or lookup.get(value.upper())
+    if member is None:
+        raise ValueError(f"{value!r} is not a valid option")
+    return member
+
+
+# Keyword classification is a pure function of the PDF text and filename, and the same file is
+# often uploaded more than once, so results are memoised by (content hash, filename). Insertion
+# order doubles as the eviction order once the cache is full.
+_CLASSIFICATION_CACHE_MAX_ENTRIES = 4096
+_classification_cache: dict[tuple[str, str], ClassificationResult] = {}
+_classification_cache_lock = threading.Lock()
+
+
+def _classify_by_hash(text: str, filename: str, file_hash: str) -> ClassificationResult:
+    key = (file_hash, filename)
+    with _classification_cache_lock:
+        cached = _classification_cache.get(key)
+    if cached is None:
+        cached = classify_document(text, filename=filename)
+        with _classification_cache_lock:
+            if len(_classification_cache) >= _CLASSIFICATION_CACHE_MAX_ENTRIES:
+                _classification_cache.pop(next(iter(_classification_cache)))
+            _classification_cache[key] = cached
+    return replace(cached, matches=list(cached.matches))
+
 
 def _run_document_pipeline(
     db: Session,
@@ -711,15 +1034,13 @@ def _run_document_pipeline(
     org_id: uuid.UUID,
     trade: str,
     filename: str,
-    pdf_bytes: bytes,
     storage_key: str,
     file_hash: str,
-    initial_text: str | None = None,
+    text: str,
 ) -> None:
-    text = initial_text or extract_text_from_pdf(io.BytesIO(pdf_bytes))
     if not text:
         raise DocumentProcessingError("Could not extract text from PDF.")
-    if len(text) < 200:
+    if len(text) < MIN_CONTENT_CHARS:
         raise DocumentProcessingError("Not enough content.")
 
     document.text_excerpt = text[:1000]
@@ -757,11 +1078,9 @@ def _run_document_pipeline(
                 document_id=document.id,
                 type="template_matched",
                 data={
-                    "document_id": str(document.id),
                     "document_template_id": str(template.id),
                     "fingerprint": fingerprint,
                     "requirement_ids": requirement_ids,
-                    "storage_key": storage_key,
                 },
             )
         )
@@ -771,7 +1090,6 @@ def _run_document_pipeline(
                 document_id=document.id,
                 type="extracted",
                 data={
-                    "document_id": str(document.id),
                     "requirement_ids": requirement_ids,
                     "latency_ms": latency_ms,
                     "storage_key": storage_key,
@@ -781,7 +1099,7 @@ def _run_document_pipeline(
         )
         return
 
-    classification = classify_document(text, filename=filename)
+    classification = _classify_by_hash(text, filename, file_hash)
     override_label = get_override_for_hash(db, org_id, file_hash)
 
     final_label = override_label or classification.label
@@ -811,28 +1129,23 @@ def _run_document_pipeline(
 
     drafts = extract_requirement_drafts(text, trade=trade)
     if not drafts:
-        raise DocumentProcessingError("No requirements extracted.")
+        # The LLM step can come back empty on a transient upstream problem; worth another try.
+        raise DocumentProcessingError("No requirements extracted.", retryable=True)
 
     attach_translations(drafts)
 
     created_payload = []
-    requirement_count = 0
+    new_requirements: list[Requirement] = []
     for draft in drafts:
         due_date = parse_due_date(draft.due_date)
 
         frequency = getattr(draft, "frequency", None)
         if isinstance(frequency, str):
-            try:
-                frequency = RequirementFrequencyEnum(frequency)
-            except ValueError:
-                frequency = RequirementFrequencyEnum(frequency.upper())
+            frequency = _lookup_enum(_FREQUENCY_BY_VALUE, frequency)
 
         anchor_type = getattr(draft, "anchor_type", None)
         if isinstance(anchor_type, str):
-            try:
-                anchor_type = RequirementAnchorTypeEnum(anchor_type)
-            except ValueError:
-                anchor_type = RequirementAnchorTypeEnum(anchor_type.upper())
+            anchor_type = _lookup_enum(_ANCHOR_TYPE_BY_VALUE, anchor_type)
         anchor_value = dict(getattr(draft, "anchor_value", {}) or {})
 
         if anchor_type is None:
@@ -876,6 +1189,7 @@ def _run_document_pipeline(
         )
 
         requirement = Requirement(
+            id=uuid.uuid4(),
             org_id=org_id,
             document_id=document.id,
             title_en=draft.title_en,
@@ -897,9 +1211,7 @@ def _run_document_pipeline(
                 **({"triage": {"reasons": triage_reasons}} if triage_reasons else {}),
             },
         )
-        db.add(requirement)
-        db.flush()
-        requirement_count += 1
+        new_requirements.append(requirement)
 
         created_payload.append(
             {
@@ -914,9 +1226,13 @@ def _run_document_pipeline(
             }
         )
 
+    # Ids are assigned up front so the whole batch goes out in one flush instead of one per row.
+    db.add_all(new_requirements)
+    db.flush()
+
     document.extracted_at = datetime.now(timezone.utc)
 
-    record_requirements_created(db, org_id, requirement_count)
+    record_requirements_created(db, org_id, len(new_requirements))
 
     latency_ms = int((document.extracted_at - document.created_at).total_seconds() * 1000) if document.created_at else 0
     db.add(
@@ -925,7 +1241,6 @@ def _run_document_pipeline(
             document_id=document.id,
             type="extracted",
             data={
-                "document_id": str(document.id),
                 "requirement_ids": [item["id"] for item in created_payload],
                 "latency_ms": latency_ms,
                 "storage_key": storage_key,
@@ -947,7 +1262,6 @@ def _mark_document_failed(
             document_id=document.id,
             type="extraction_failed",
             data={
-                "document_id": str(document.id),
                 "storage_key": storage_key,
                 "reason": reason,
             },
@@ -89,22 +89,17 @@ def upload_permit(
     if not file.filename:
         raise HTTPException(status_code=400, detail="Filename required")
 
-    buffer = io.BytesIO()
-    total_bytes = 0
-    while True:
-        chunk = file.file.read(1024 * 1024)
-        if not chunk:
-            break
-        total_bytes += len(chunk)
-        if total_bytes > MAX_UPLOAD_BYTES:
-            raise HTTPException(status_code=400, detail="File too large.")
-        buffer.write(chunk)
-    buffer.seek(0)
+    # The multipart parser has already spooled the upload (memory, then disk): size-check it in
+    # place and stream that same file to storage instead of copying it into a BytesIO first.
+    upload = file.file
+    upload.seek(0, io.SEEK_END)
+    if upload.tell() > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=400, detail="File too large.")
 
     storage = get_storage_service()
     stored = storage.upload_fileobj(
         context.org.id,
-        buffer,
+        upload,
         filename=file.filename,
         content_type=file.content_type or "application/octet-stream",
     )
@@ -185,7 +180,7 @@ def download_permit(
 
     upload_event = (
         db.query(Event)
-        .filter(Event.type == "permit_uploaded", Event.data["permit_id"].astext == str(permit.id))
+        .filter(Event.type == "permit_uploaded", Event.data.contains({"permit_id": str(permit.id)}))
         .order_by(Event.at.desc())
         .first()
     )
@@ -8,7 +8,7 @@ from typing import Any, Dict
 from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 from sqlalchemy import or_, and_
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from ..dependencies.auth import AuthContext, require_auth
 from ..dependencies.db import get_db
@@ -91,22 +91,25 @@ def list_requirements(
     context: AuthContext = Depends(require_auth),
     db: Session = Depends(get_db),
 ):
+    # Pages share a handful of documents, so load each once with an IN query rather than per row.
     query = (
         db.query(Requirement)
-        .options(joinedload(Requirement.document))
+        .options(selectinload(Requirement.document))
         .filter(Requirement.org_id == context.org.id)
     )
 
     archive_state_field = Requirement.attributes["archive"]["state"].astext
     archived_states = ("archived", "deleted", "pending")
     if archived:
+        # Containment rather than ->> so the jsonb_path_ops index on attributes can serve it.
         query = query.filter(
             or_(
-                archive_state_field.in_(archived_states),
+                *(Requirement.attributes.contains({"archive": {"state": state}}) for state in archived_states),
                 Requirement.status == RequirementStatusEnum.ARCHIVED,
             )
         )
     else:
+        # A GIN index cannot answer a negation, and ->> keeps the NULL-attributes rows in.
         query = query.filter(
             and_(
                 or_(archive_state_field.is_(None), archive_state_field.notin_(archived_states)),
@@ -309,6 +312,7 @@ def bulk_triage_requirements(
 
     requirements = (
         db.query(Requirement)
+        .options(selectinload(Requirement.document))
         .filter(Requirement.org_id == context.org.id, Requirement.id.in_(requirement_ids))
         .all()
     )
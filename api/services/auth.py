@@ -8,7 +8,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
-from sqlalchemy import func
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 
 from ..config import settings
@@ -21,7 +21,7 @@ from ..models import (
     User,
     UserSession,
 )
-from .email import EmailMessage, get_email_client
+from .email import EmailClient, EmailMessage, get_email_client
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +34,15 @@ class AuthService:
     def __init__(self, db: Session) -> None:
         self.db = db
         self.serializer = URLSafeTimedSerializer(settings.magic_link_secret, salt="magic-link")
-        self.email_client = get_email_client()
+        self._email_client: EmailClient | None = None
+
+    @property
+    def email_client(self) -> EmailClient:
+        # Built on first send only: most AuthService instances resolve sessions and never email, and
+        # constructing the SES client (plus its probe call outside production) is not free.
+        if self._email_client is None:
+            self._email_client = get_email_client()
+        return self._email_client
 
     # --- Magic link flow -------------------------------------------------
     def request_magic_link(
@@ -44,6 +52,8 @@ class AuthService:
         request_ip: Optional[str] = None,
         user_agent: Optional[str] = None,
         redirect_path: Optional[str] = None,
+        *,
+        send_email: bool = True,
     ) -> str:
         normalized_email = email.strip().lower()
         if not normalized_email:
@@ -77,6 +87,21 @@ class AuthService:
         )
 
         magic_link = f"{settings.app_url}/auth/callback?token={signed_token}"
+        if send_email:
+            self.send_magic_link_email(normalized_email, magic_link)
+
+        logger.info(
+            "magic_link_issued user_id=%s org_id=%s request_ip=%s user_agent=%s",
+            user.id,
+            org.id,
+            request_ip,
+            user_agent,
+        )
+
+        self.db.commit()
+        return magic_link
+
+    def send_magic_link_email(self, email: str, magic_link: str) -> None:
         text_body = (
             "Your Compliance Copilot login link is ready.\n\n"
             f"Click to sign in: {magic_link}\n\n"
@@ -87,26 +112,15 @@ class AuthService:
         try:
             self.email_client.send(
                 EmailMessage(
-                    to=normalized_email,
+                    to=email,
                     subject="Your Compliance Copilot login link",
                     text_body=text_body,
                 )
             )
         except Exception as exc:  # pragma: no cover - email errors
-            logger.error("Failed to send magic link: email=%s error=%s", normalized_email, exc)
+            logger.error("Failed to send magic link: email=%s error=%s", email, exc)
             raise AuthError("Could not send magic link") from exc
 
-        logger.info(
-            "magic_link_issued user_id=%s org_id=%s request_ip=%s user_agent=%s",
-            user.id,
-            org.id,
-            request_ip,
-            user_agent,
-        )
-
-        self.db.commit()
-        return magic_link
-
     def redeem_magic_link(self, signed_token: str) -> tuple[User, Org, str, str]:
         try:
             payload = self.serializer.loads(
@@ -172,49 +186,51 @@ class AuthService:
             return None
         hashed = self.hash_token(raw_token)
         now = datetime.now(timezone.utc)
-        row = (
-            self.db.query(UserSession, User, Org)
+        # Session, user and org come back from one joined SELECT; nothing is lazy-loaded later.
+        row = self.db.execute(
+            select(UserSession, User, Org)
             .join(User, User.id == UserSession.user_id)
             .join(Org, Org.id == UserSession.org_id)
-            .filter(
+            .where(
                 UserSession.session_token_hash == hashed,
                 UserSession.revoked_at.is_(None),
                 UserSession.expires_at > now,
                 User.is_active.is_(True),
             )
-            .one_or_none()
-        )
+        ).one_or_none()
         return row
 
     def revoke_session(self, raw_token: str) -> None:
         hashed = self.hash_token(raw_token)
         now = datetime.now(timezone.utc)
-        updated = (
-            self.db.query(UserSession)
-            .filter(UserSession.session_token_hash == hashed, UserSession.revoked_at.is_(None))
-            .update({"revoked_at": now})
-        )
+        # No loaded UserSession needs syncing, so skip the identity-map scan an ORM update performs.
+        updated = self.db.execute(
+            update(UserSession)
+            .where(UserSession.session_token_hash == hashed, UserSession.revoked_at.is_(None))
+            .values(revoked_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
         if updated:
-            logger.info("session_revoked hash=%s", hashed[:8])
+            logger.info("session_revoked hash=%s", hashed[:4].hex())
         self.db.commit()
 
     # --- Helpers ---------------------------------------------------------
     @staticmethod
-    def hash_token(value: str) -> str:
-        return hashlib.sha256(value.encode("utf-8")).hexdigest()
+    def hash_token(value: str) -> bytes:
+        return hashlib.sha256(value.encode("utf-8")).digest()
 
-    def get_or_create_user(self, email: str, preferred_locale: str) -> User:
-        user = (
-            self.db.query(User)
-            .filter(func.lower(User.email) == email.lower())
-            .one_or_none()
-        )
+    def get_or_create_user(self, email: str, preferred_locale: str, *, flush: bool = True) -> User:
+        user = self.db.execute(
+            select(User).where(func.lower(User.email) == email.lower())
+        ).scalar_one_or_none()
         if user:
             return user
 
-        user = User(email=email, preferred_locale=preferred_locale)
+        # The id is assigned up front so callers that skip the flush can still reference it.
+        user = User(id=uuid.uuid4(), email=email, preferred_locale=preferred_locale)
         self.db.add(user)
-        self.db.flush()
+        if flush:
+            self.db.flush()
         return user
 
     def ensure_primary_membership(self, user: User) -> Org:
@@ -9,7 +9,8 @@ from ..config import settings
 
 
 def boto3_client(service: str) -> Any:
-    kwargs: dict[str, Any] = {"region_name": settings.aws.region, "config": Config(retries={"max_attempts": 3})}
+    config = Config(retries={"max_attempts": 3}, max_pool_connections=settings.aws.max_pool_connections)
+    kwargs: dict[str, Any] = {"region_name": settings.aws.region, "config": config}
     if settings.aws.access_key_id and settings.aws.secret_access_key:
         kwargs["aws_access_key_id"] = settings.aws.access_key_id
         kwargs["aws_secret_access_key"] = settings.aws.secret_access_key
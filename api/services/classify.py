@@ -157,7 +157,7 @@ def get_override_for_hash(db: Session, org_id: UUID, file_hash: str) -> str | No
         .filter(
             Event.org_id == org_id,
             Event.type == "classification_override",
-            Event.data["file_hash"].astext == file_hash,
+            Event.data.contains({"file_hash": file_hash}),
         )
         .order_by(Event.at.desc())
         .first()
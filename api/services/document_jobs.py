@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from ..models.document_jobs import DocumentJob, DocumentJobStatusEnum
+
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF = timedelta(minutes=5)
+# A claimed job is hidden from other workers for this long; if the worker dies mid-run the job is
+# picked up again once the lease lapses, with the lost run counted as an attempt.
+CLAIM_LEASE = timedelta(minutes=15)
+
+
+def enqueue_document_job(
+    db: Session,
+    *,
+    org_id: UUID,
+    document_id: UUID,
+    payload: dict[str, Any],
+) -> DocumentJob:
+    """Queue an uploaded document for the document worker; committed with the caller's transaction."""
+    job = DocumentJob(org_id=org_id, document_id=document_id, payload=payload)
+    db.add(job)
+    return job
+
+
+def _claim_next_job(db: Session, now: datetime) -> Optional[DocumentJob]:
+    job = (
+        db.query(DocumentJob)
+        .filter(
+            DocumentJob.status == DocumentJobStatusEnum.PENDING,
+            DocumentJob.run_at <= now,
+        )
+        .order_by(DocumentJob.run_at.asc())
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .first()
+    )
+    if job is None:
+        return None
+
+    job.attempts = (job.attempts or 0) + 1
+    job.last_attempt_at = now
+    job.run_at = now + CLAIM_LEASE
+    db.commit()
+    return job
+
+
+class DocumentJobAbandoned(Exception):
+    """Passed to ``on_give_up`` for a job whose worker stopped during its final attempt."""
+
+
+def _give_up(
+    job: DocumentJob,
+    exc: Exception,
+    on_give_up: Optional[Callable[[DocumentJob, Exception], None]],
+) -> None:
+    job.status = DocumentJobStatusEnum.FAILED
+    if on_give_up is None:
+        return
+    try:
+        on_give_up(job, exc)
+    except Exception:
+        logger.exception("Failed to clean up after document job: %s", job.id)
+
+
+def dispatch_document_jobs(
+    db: Session,
+    handler: Callable[[DocumentJob], None],
+    *,
+    on_give_up: Optional[Callable[[DocumentJob, Exception], None]] = None,
+    now: datetime | None = None,
+    batch_size: int = 10,
+) -> dict[str, int]:
+    """Run up to ``batch_size`` due jobs through ``handler``, one at a time.
+
+    Each job is claimed and committed before the handler runs, and its outcome is committed right
+    after, so no transaction stays open across a pipeline run and jobs that already finished are
+    never rolled back to PENDING. Failed jobs are retried with backoff unless the exception has
+    ``retryable = False``; ``on_give_up`` runs once a job will not be tried again.
+    """
+    stats = defaultdict(int)
+
+    for _ in range(batch_size):
+        claimed_at = now or datetime.now(timezone.utc)
+        job = _claim_next_job(db, claimed_at)
+        if job is None:
+            break
+
+        if job.attempts > MAX_ATTEMPTS:
+            # The final attempt was claimed but never reported back; its worker died mid-run.
+            job.last_error = "Worker stopped during the final attempt"
+            _give_up(job, DocumentJobAbandoned(job.last_error), on_give_up)
+            stats["failed"] += 1
+            db.commit()
+            continue
+
+        try:
+            handler(job)
+        except Exception as exc:
+            logger.exception("Document job failed: %s", job.id)
+            job.last_error = str(exc)[:500]
+            if job.attempts >= MAX_ATTEMPTS or not getattr(exc, "retryable", True):
+                _give_up(job, exc, on_give_up)
+                stats["failed"] += 1
+            else:
+                job.run_at = claimed_at + RETRY_BACKOFF * job.attempts
+                stats["retried"] += 1
+        else:
+            job.status = DocumentJobStatusEnum.DONE
+            job.last_error = None
+            stats["processed"] += 1
+        db.commit()
+
+    return stats
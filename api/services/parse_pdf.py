@@ -1,12 +1,57 @@
 from __future__ import annotations
 
 import io
-from typing import BinaryIO, Optional, Union
+from typing import BinaryIO, Iterable, Iterator, Optional, Union
 
 import pdfplumber
+import pypdfium2
 
+from ..config import settings
 
-def extract_text_from_pdf(source: Union[str, bytes, BinaryIO]) -> Optional[str]:
+
+def _pdfplumber_pages(pdf: pdfplumber.PDF) -> Iterator[str]:
+    for page in pdf.pages:
+        yield page.extract_text() or ""
+
+
+def _pdfium_pages(document: pypdfium2.PdfDocument) -> Iterator[str]:
+    # PDFium (C++) extracts text an order of magnitude faster than pdfminer, but its reading order
+    # and spacing differ, so fingerprints of known templates change when switching backends.
+    for index in range(len(document)):
+        page = document[index]
+        textpage = page.get_textpage()
+        try:
+            yield textpage.get_text_bounded().replace("\r\n", "\n")
+        finally:
+            textpage.close()
+            page.close()
+
+
+def _join_pages(pages: Iterable[str], max_chars: Optional[int]) -> str:
+    # Pages are extracted lazily, so stopping early skips parsing the rest of the document.
+    parts: list[str] = []
+    # Running lengths of the joined text with leading whitespace dropped, with and without its
+    # trailing whitespace; the latter is exactly the length the stripped result would have.
+    joined = 0
+    stripped = 0
+    for page_text in pages:
+        piece = "\n" + page_text if joined else page_text.lstrip()
+        if piece.strip():
+            stripped = joined + len(piece.rstrip())
+        joined += len(piece)
+        parts.append(page_text)
+        if max_chars is not None and stripped >= max_chars:
+            break
+    text = "\n".join(parts).strip()
+    return text[:max_chars] if max_chars is not None else text
+
+
+def extract_text_from_pdf(source: Union[str, bytes, BinaryIO], max_chars: Optional[int] = None) -> Optional[str]:
+    """Return the PDF's text, or None when it has none or cannot be parsed.
+
+    With ``max_chars`` only as many pages as needed to reach that many characters are parsed and
+    the result is cut to that length; use it when the caller only needs a prefix.
+    """
     try:
         if isinstance(source, (bytes, bytearray)):
             buffer = io.BytesIO(source)
@@ -16,9 +61,18 @@ def extract_text_from_pdf(source: Union[str, bytes, BinaryIO]) -> Optional[str]:
         else:
             buffer = source
 
-        with pdfplumber.open(buffer) as pdf:
-            pages = [page.extract_text() or "" for page in pdf.pages]
-        text = "\n".join(pages).strip()
+        if settings.pdf_text_backend == "pdfium":
+            document = pypdfium2.PdfDocument(buffer)
+            pages = _pdfium_pages(document)
+            try:
+                text = _join_pages(pages, max_chars)
+            finally:
+                # Release the page an early stop left open before the document itself.
+                pages.close()
+                document.close()
+        else:
+            with pdfplumber.open(buffer) as pdf:
+                text = _join_pages(_pdfplumber_pages(pdf), max_chars)
         return text if text else None
     except Exception:
         return None
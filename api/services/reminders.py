@@ -209,7 +209,8 @@ def queue_reminders(db: Session, *, now: datetime | None = None) -> dict[str, in
                     )
                     record_reminder_scheduled(db, req.org_id)
 
-    permits = db.query(Permit).filter(Permit.expires_at.isnot(None)).all()
+    # Already-expired rows are skipped in SQL rather than loaded and discarded in the loop below.
+    permits = db.query(Permit).filter(Permit.expires_at > now).all()
     for permit in permits:
         due = permit.expires_at
         if not due or due <= now:
@@ -258,7 +259,7 @@ def queue_reminders(db: Session, *, now: datetime | None = None) -> dict[str, in
                     )
                     record_reminder_scheduled(db, permit.org_id)
 
-    certs = db.query(TrainingCert).filter(TrainingCert.expires_at.isnot(None)).all()
+    certs = db.query(TrainingCert).filter(TrainingCert.expires_at > now).all()
     for cert in certs:
         due = cert.expires_at
         if not due or due <= now:
@@ -4,14 +4,24 @@ import io
 import uuid
 from dataclasses import dataclass
 from datetime import timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import BinaryIO, Optional
 
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import BotoCoreError, ClientError
 
 from ..config import settings
 from .aws import boto3_client
 
+# Uploads are capped at 20 MiB, so anything over 8 MiB goes up as 8 MiB parts in parallel.
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True,
+)
+
 
 @dataclass
 class StoredFile:
@@ -48,7 +58,7 @@ class StorageService:
         extra_args = {"ContentType": content_type}
 
         try:
-            self._client.upload_fileobj(buffer, self.bucket, key, ExtraArgs=extra_args)
+            self._client.upload_fileobj(buffer, self.bucket, key, ExtraArgs=extra_args, Config=_TRANSFER_CONFIG)
         except (BotoCoreError, ClientError) as exc:
             raise RuntimeError(f"Failed to upload to S3: {exc}") from exc
 
@@ -68,12 +78,33 @@ class StorageService:
         except (BotoCoreError, ClientError) as exc:
             raise RuntimeError(f"Failed to generate presigned URL: {exc}") from exc
 
+    def download_fileobj(self, key: str, file_obj: BinaryIO) -> None:
+        try:
+            self._client.download_fileobj(self.bucket, key, file_obj, Config=_TRANSFER_CONFIG)
+        except (BotoCoreError, ClientError) as exc:
+            raise RuntimeError(f"Failed to download S3 object: {exc}") from exc
+
     def delete(self, key: str) -> None:
         try:
             self._client.delete_object(Bucket=self.bucket, Key=key)
         except (BotoCoreError, ClientError) as exc:
             raise RuntimeError(f"Failed to delete S3 object: {exc}") from exc
 
+    def head(self, key: str) -> dict | None:
+        """Return object metadata without opening a body stream, or None if the key is missing."""
+        try:
+            obj = self._client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in {"404", "NoSuchKey", "NotFound"}:
+                return None
+            raise RuntimeError(f"Failed to inspect S3 object: {exc}") from exc
+        except BotoCoreError as exc:
+            raise RuntimeError(f"Failed to inspect S3 object: {exc}") from exc
+        return {
+            "content_type": obj.get("ContentType", "application/octet-stream"),
+            "content_length": obj.get("ContentLength"),
+        }
+
     def open_stream(self, key: str):
         try:
             obj = self._client.get_object(Bucket=self.bucket, Key=key)
@@ -99,5 +130,8 @@ class StorageService:
             raise RuntimeError(f"Failed to download S3 object: {exc}") from exc
 
 
+@lru_cache(maxsize=1)
 def get_storage_service() -> StorageService:
+    # One shared service (and boto3 client, which is thread-safe) per process, so requests and
+    # background tasks skip client construction and reuse its connection pool.
     return StorageService()
@@ -13,11 +13,22 @@ from .schedule import compute_next_due
 
 
 _WHITESPACE_RE = re.compile(r"\s+")
+_FINGERPRINT_CHARS = 5000
+# Normalising a bounded head yields the same leading characters as normalising the whole text, so
+# long documents only pay for the part that is fingerprinted. lower() is position-independent except
+# for the Greek final sigma, so heads containing a capital sigma take the full path.
+_FINGERPRINT_HEAD_CHARS = 4 * _FINGERPRINT_CHARS
 
 
 def _normalize_text(text: str) -> str:
-    cleaned = _WHITESPACE_RE.sub(" ", text.strip().lower())
-    return cleaned[:5000]
+    stripped = text.strip()
+    if len(stripped) > _FINGERPRINT_HEAD_CHARS:
+        head = stripped[:_FINGERPRINT_HEAD_CHARS]
+        if "\u03a3" not in head:
+            cleaned = _WHITESPACE_RE.sub(" ", head.lower())
+            if len(cleaned) > _FINGERPRINT_CHARS:
+                return cleaned[:_FINGERPRINT_CHARS]
+    return _WHITESPACE_RE.sub(" ", stripped.lower())[:_FINGERPRINT_CHARS]
 
 
 def compute_fingerprint(text: str) -> str:
@@ -88,6 +99,5 @@ def instantiate_from_template(
     document: Document,
 ) -> Iterable[Requirement]:
     requirements = [_to_requirement(req_template, document=document) for req_template in template.requirement_templates]
-    for requirement in requirements:
-        db.add(requirement)
+    db.add_all(requirements)
     return requirements
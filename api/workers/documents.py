@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import logging
+import sys
+
+from apscheduler.schedulers.blocking import BlockingScheduler
+from apscheduler.triggers.interval import IntervalTrigger
+
+from ..routers.documents import fail_document_job, process_document_job
+from ..services.document_jobs import dispatch_document_jobs
+from .reminders import session_scope
+
+
+logger = logging.getLogger(__name__)
+
+
+def run_dispatch_job() -> None:
+    with session_scope() as session:
+        stats = dispatch_document_jobs(session, process_document_job, on_give_up=fail_document_job)
+    if stats:
+        logger.info("Processed document jobs: %s", dict(stats))
+
+
+def configure_scheduler() -> BlockingScheduler:
+    scheduler = BlockingScheduler(timezone="UTC")
+    scheduler.add_job(run_dispatch_job, IntervalTrigger(seconds=10), max_instances=1, coalesce=True)
+    return scheduler
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, handlers=[logging.StreamHandler(sys.stdout)])
+
+    if len(sys.argv) > 1 and sys.argv[1] == "run-once":
+        logger.info("Running document worker once")
+        run_dispatch_job()
+        return
+
+    scheduler = configure_scheduler()
+    logger.info("Starting document worker scheduler")
+    scheduler.start()
+
+
+if __name__ == "__main__":
+    main()
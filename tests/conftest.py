@@ -17,6 +17,7 @@ if str(ROOT_DIR) not in sys.path:
 
 from api.config import settings
 from api.db.session import SessionLocal
+from api.dependencies.auth import clear_session_cache
 from api.models import UserSession
 from api.main import app
 from api.services.auth import AuthService
@@ -71,10 +72,11 @@ def auth_context(client: TestClient) -> Iterator[dict[str, str]]:
 def cleanup_database() -> Iterator[None]:
     """Truncate core tables after every test to keep isolation."""
     yield
+    clear_session_cache()
     with SessionLocal() as session:
         session.execute(
             text(
-                "TRUNCATE TABLE login_tokens, user_sessions, memberships, requirements, requirement_templates, document_templates, reminder_jobs, documents, events, permits, training_certs, org_requirement_metrics, users, orgs RESTART IDENTITY CASCADE"
+                "TRUNCATE TABLE login_tokens, user_sessions, memberships, requirements, requirement_templates, document_templates, reminder_jobs, document_jobs, documents, events, permits, training_certs, org_requirement_metrics, users, orgs RESTART IDENTITY CASCADE"
             )
         )
         session.commit()
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from api.services import parse_pdf
+
+FIXTURE = Path(__file__).resolve().parents[1] / "fixtures" / "electrical_sample.pdf"
+
+
+def test_pdfium_backend_extracts_text_from_file_object(monkeypatch) -> None:
+    monkeypatch.setattr(parse_pdf.settings, "pdf_text_backend", "pdfium")
+
+    with FIXTURE.open("rb") as handle:
+        text = parse_pdf.extract_text_from_pdf(handle)
+        assert not handle.closed
+
+    assert text
+    assert "\r" not in text
+    assert "electrical" in text.lower()
+
+
+def test_pdfium_backend_returns_none_for_invalid_pdf(monkeypatch) -> None:
+    monkeypatch.setattr(parse_pdf.settings, "pdf_text_backend", "pdfium")
+
+    assert parse_pdf.extract_text_from_pdf(b"not a pdf") is None
+
+
+def test_max_chars_returns_prefix_of_full_text(monkeypatch) -> None:
+    monkeypatch.setattr(parse_pdf.settings, "pdf_text_backend", "pdfium")
+    data = FIXTURE.read_bytes()
+
+    full_text = parse_pdf.extract_text_from_pdf(data)
+    prefix = parse_pdf.extract_text_from_pdf(data, max_chars=200)
+
+    assert prefix is not None and len(prefix) == 200
+    assert full_text is not None and full_text.startswith(prefix)
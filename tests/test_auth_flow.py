@@ -17,7 +17,12 @@ def test_magic_link_request_endpoint(client, monkeypatch):
         called["locale"] = preferred_locale
         return "https://app.example.com/auth/callback?token=fake"
 
+    def fake_send_magic_link_email(self, email: str, magic_link: str) -> None:  # type: ignore[override]
+        called["sent_to"] = email
+        called["link"] = magic_link
+
     monkeypatch.setattr(AuthService, "request_magic_link", fake_request_magic_link)
+    monkeypatch.setattr(AuthService, "send_magic_link_email", fake_send_magic_link_email)
 
     response = client.post(
         "/auth/magic-link",
@@ -28,6 +33,8 @@ def test_magic_link_request_endpoint(client, monkeypatch):
     assert response.json() == {"status": "sent"}
     assert called["email"] == "owner@example.com"
     assert called["locale"] == "es"
+    assert called["sent_to"] == "owner@example.com"
+    assert called["link"] == "https://app.example.com/auth/callback?token=fake"
 
 
 def test_magic_link_callback_and_me_endpoint(client):
@@ -116,3 +123,32 @@ def test_logout_revokes_session(client):
             .one()
         )
         assert persisted.revoked_at is not None
+
+
+def test_logout_evicts_cached_session(client, auth_context, monkeypatch):
+    monkeypatch.setattr(settings, "session_cache_ttl_seconds", 30)
+    assert client.get("/auth/me").status_code == 200
+    # Second lookup is served from the session cache.
+    assert client.get("/auth/me").status_code == 200
+
+    response = client.post("/auth/logout")
+    assert response.status_code == 200
+
+    client.cookies.set(settings.cookie_name, auth_context["token"])
+    assert client.get("/auth/me").status_code == 401
+
+
+def test_session_revoked_elsewhere_is_rejected_by_default(client, auth_context):
+    """Without the opt-in cache, a revocation made by another worker applies on the next request."""
+    assert client.get("/auth/me").status_code == 200
+
+    with SessionLocal() as session:
+        persisted = (
+            session.query(UserSession)
+            .filter(UserSession.session_token_hash == AuthService.hash_token(auth_context["token"]))
+            .one()
+        )
+        persisted.revoked_at = datetime.now(timezone.utc)
+        session.commit()
+
+    assert client.get("/auth/me").status_code == 401
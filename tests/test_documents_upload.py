@@ -17,6 +17,7 @@ from api.models.requirements import (
     RequirementStatusEnum,
 )
 from api.models.templates import DocumentTemplate, RequirementTemplate
+from api.services.storage import get_storage_service
 from api.services.template_matching import compute_fingerprint
 
 
@@ -30,10 +31,12 @@ def mock_s3():
         s3.create_bucket(Bucket=bucket)
         previous_bucket = settings.aws.s3_bucket
         settings.aws.s3_bucket = bucket
+        get_storage_service.cache_clear()
         try:
             yield s3
         finally:
             settings.aws.s3_bucket = previous_bucket
+            get_storage_service.cache_clear()
 
 
 def test_upload_rejects_non_pdf(client, auth_context, mock_s3):
@@ -53,11 +56,53 @@ def test_upload_rejects_non_pdf(client, auth_context, mock_s3):
     assert response.json()["detail"] == "PDF only."
 
 
+def test_upload_rejects_oversized_content_length(client, auth_context, mock_s3):
+    from api.routers.documents import MAX_UPLOAD_BYTES
+
+    oversized = b"%PDF-1.7\n" + b"A" * (MAX_UPLOAD_BYTES + 128 * 1024)
+    response = client.post(
+        "/documents/upload",
+        data={"trade": "electrical"},
+        files={"file": ("huge.pdf", io.BytesIO(oversized), "application/pdf")},
+    )
+    assert response.status_code == 413
+    assert not mock_s3.list_objects_v2(Bucket=settings.aws.s3_bucket).get("Contents")
+
+
+def test_upload_rejects_file_just_over_limit(client, auth_context, mock_s3):
+    """Bodies within the multipart allowance still hit the size check in the handler."""
+    from api.routers.documents import MAX_UPLOAD_BYTES
+
+    oversized = b"%PDF-1.7\n" + b"A" * MAX_UPLOAD_BYTES
+    response = client.post(
+        "/documents/upload",
+        data={"trade": "electrical"},
+        files={"file": ("big.pdf", io.BytesIO(oversized), "application/pdf")},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "File too large."
+    assert not mock_s3.list_objects_v2(Bucket=settings.aws.s3_bucket).get("Contents")
+
+
+def test_upload_executor_runs_one_upload_per_request_thread():
+    """Each request thread can have its S3 upload in flight at once; none waits for a free worker."""
+    import threading
+
+    from api.routers import documents
+
+    barrier = threading.Barrier(documents._REQUEST_THREADS)
+    futures = [
+        documents._UPLOAD_EXECUTOR.submit(barrier.wait, 5) for _ in range(documents._REQUEST_THREADS)
+    ]
+    for future in futures:
+        future.result(timeout=10)
+
+
 def test_upload_rejects_short_pdf(client, auth_context, mock_s3, monkeypatch):
     """PDFs with <200 characters should respond with 400 and helpful message."""
     from api.routers import documents
 
-    monkeypatch.setattr(documents, "extract_text_from_pdf", lambda _: "too short")
+    monkeypatch.setattr(documents, "extract_text_from_pdf", lambda _, **_kwargs: "too short")
 
     response = client.post(
         "/documents/upload",
@@ -72,7 +117,7 @@ def test_upload_happy_path_creates_multiple_tasks(client, auth_context, mock_s3,
     """Happy path should create ≥5 tasks and persist the S3 object."""
     from api.routers import documents
 
-    monkeypatch.setattr(documents, "extract_text_from_pdf", lambda _: "a" * 500)
+    monkeypatch.setattr(documents, "extract_text_from_pdf", lambda _, **_kwargs: "a" * 500)
 
     drafts: list[SimpleNamespace] = []
     for idx, category in enumerate(["compliance", "permits", "training", "compliance", "training"], start=1):
@@ -151,6 +196,212 @@ def _mock_extract(text: str, trade: str = "electrical"):
     assert any(item["id"] == payload["id"] for item in listing_items)
 
 
+def test_upload_in_queue_mode_defers_processing_to_worker(client, auth_context, mock_s3, monkeypatch):
+    from api.models.document_jobs import DocumentJob, DocumentJobStatusEnum
+    from api.routers import documents
+    from api.services.document_jobs import dispatch_document_jobs
+
+    extract_limits: list[int | None] = []
+
+    def fake_extract_text(_, max_chars=None):
+        extract_limits.append(max_chars)
+        return "a" * 500
+
+    monkeypatch.setattr(settings, "document_processing_mode", "queue")
+    monkeypatch.setattr(documents, "extract_text_from_pdf", fake_extract_text)
+    monkeypatch.setattr(
+        documents,
+        "extract_requirement_drafts",
+        lambda text, trade="electrical": [
+            SimpleNamespace(
+                title_en="Queued requirement",
+                title_es=None,
+                description_en="Stay compliant",
+                description_es=None,
+                category="compliance",
+                frequency=RequirementFrequencyEnum.ANNUAL,
+                due_date=None,
+                source_ref="Sec. 1",
+                confidence=0.9,
+                origin="llm",
+                attributes={},
+            )
+        ],
+    )
+    monkeypatch.setattr(documents, "attach_translations", lambda drafts: drafts)
+
+    pdf_bytes = b"%PDF-1.7\n" + b"A" * 1024 + b"\n%%EOF"
+    response = client.post(
+        "/documents/upload",
+        data={"trade": "electrical"},
+        files={"file": ("queued.pdf", io.BytesIO(pdf_bytes), "application/pdf")},
+    )
+    assert response.status_code == 202
+    doc_id = uuid.UUID(response.json()["id"])
+
+    with SessionLocal() as session:
+        assert not session.execute(select(Requirement).where(Requirement.document_id == doc_id)).first()
+        job = session.execute(select(DocumentJob).where(DocumentJob.document_id == doc_id)).scalar_one()
+        assert job.status == DocumentJobStatusEnum.PENDING
+        assert job.payload["filename"] == "queued.pdf"
+
+        stats = dispatch_document_jobs(session, documents.process_document_job)
+        session.commit()
+        assert stats == {"processed": 1}
+
+        session.refresh(job)
+        assert job.status == DocumentJobStatusEnum.DONE
+        titles = session.execute(
+            select(Requirement.title_en).where(Requirement.document_id == doc_id)
+        ).scalars().all()
+    assert titles == ["Queued requirement"]
+    # The upload only validates a prefix; the worker extracts the full text.
+    assert extract_limits == [documents.MIN_CONTENT_CHARS, None]
+
+
+def test_queued_job_retries_pipeline_errors_before_failing_document(client, auth_context, mock_s3, monkeypatch):
+    from datetime import datetime, timedelta, timezone
+
+    from api.models.document_jobs import DocumentJob, DocumentJobStatusEnum
+    from api.models.events import Event
+    from api.routers import documents
+    from api.services.document_jobs import MAX_ATTEMPTS, dispatch_document_jobs
+
+    def failing_extract(text, trade="electrical"):
+        raise RuntimeError("LLM unavailable")
+
+    monkeypatch.setattr(settings, "document_processing_mode", "queue")
+    monkeypatch.setattr(documents, "extract_text_from_pdf", lambda _, **_kwargs: "a" * 500)
+    monkeypatch.setattr(documents, "extract_requirement_drafts", failing_extract)
+
+    pdf_bytes = b"%PDF-1.7\n" + b"A" * 1024 + b"\n%%EOF"
+    response = client.post(
+        "/documents/upload",
+        data={"trade": "electrical"},
+        files={"file": ("flaky.pdf", io.BytesIO(pdf_bytes), "application/pdf")},
+    )
+    assert response.status_code == 202
+    doc_id = uuid.UUID(response.json()["id"])
+
+    def failure_events(session) -> list[Event]:
+        return list(
+            session.execute(
+                select(Event).where(Event.document_id == doc_id, Event.type == "extraction_failed")
+            ).scalars()
+        )
+
+    start = datetime.now(timezone.utc)
+    with SessionLocal() as session:
+        for attempt in range(1, MAX_ATTEMPTS):
+            stats = dispatch_document_jobs(
+                session,
+                documents.process_document_job,
+                on_give_up=documents.fail_document_job,
+                now=start + timedelta(days=attempt - 1),
+            )
+            assert stats == {"retried": 1}
+
+            job = session.execute(select(DocumentJob).where(DocumentJob.document_id == doc_id)).scalar_one()
+            session.refresh(job)
+            assert job.status == DocumentJobStatusEnum.PENDING
+            assert job.attempts == attempt
+            assert "LLM unavailable" in job.last_error
+            # Still retryable: the document isn't failed and its PDF is kept for the next attempt.
+            assert not failure_events(session)
+            assert mock_s3.list_objects_v2(Bucket=settings.aws.s3_bucket).get("Contents")
+
+        stats = dispatch_document_jobs(
+            session,
+            documents.process_document_job,
+            on_give_up=documents.fail_document_job,
+            now=start + timedelta(days=MAX_ATTEMPTS),
+        )
+        assert stats == {"failed": 1}
+
+        session.refresh(job)
+        assert job.status == DocumentJobStatusEnum.FAILED
+        assert job.attempts == MAX_ATTEMPTS
+        assert [event.data["reason"] for event in failure_events(session)] == ["Unexpected failure"]
+        assert not session.execute(select(Requirement).where(Requirement.document_id == doc_id)).first()
+    assert not mock_s3.list_objects_v2(Bucket=settings.aws.s3_bucket).get("Contents")
+
+
+def test_queued_job_fails_unreadable_document_without_retrying(client, auth_context, mock_s3, monkeypatch):
+    from api.models.document_jobs import DocumentJob, DocumentJobStatusEnum
+    from api.models.events import Event
+    from api.routers import documents
+    from api.services.document_jobs import dispatch_document_jobs
+
+    def fake_extract_text(_, max_chars=None):
+        # Enough text to pass upload validation, too little once the worker reads the whole PDF.
+        return "a" * 500 if max_chars else "too short"
+
+    monkeypatch.setattr(settings, "document_processing_mode", "queue")
+    monkeypatch.setattr(documents, "extract_text_from_pdf", fake_extract_text)
+
+    pdf_bytes = b"%PDF-1.7\n" + b"A" * 1024 + b"\n%%EOF"
+    response = client.post(
+        "/documents/upload",
+        data={"trade": "electrical"},
+        files={"file": ("sparse.pdf", io.BytesIO(pdf_bytes), "application/pdf")},
+    )
+    assert response.status_code == 202
+    doc_id = uuid.UUID(response.json()["id"])
+
+    with SessionLocal() as session:
+        stats = dispatch_document_jobs(
+            session,
+            documents.process_document_job,
+            on_give_up=documents.fail_document_job,
+        )
+        assert stats == {"failed": 1}
+
+        job = session.execute(select(DocumentJob).where(DocumentJob.document_id == doc_id)).scalar_one()
+        assert job.status == DocumentJobStatusEnum.FAILED
+        assert job.attempts == 1
+        reasons = session.execute(
+            select(Event.data["reason"].astext).where(
+                Event.document_id == doc_id, Event.type == "extraction_failed"
+            )
+        ).scalars().all()
+        assert reasons == ["Not enough content."]
+    assert not mock_s3.list_objects_v2(Bucket=settings.aws.s3_bucket).get("Contents")
+
+
+def test_queued_job_abandoned_on_final_attempt_is_failed_not_rerun(client, auth_context, mock_s3, monkeypatch):
+    from api.models.document_jobs import DocumentJob, DocumentJobStatusEnum
+    from api.routers import documents
+    from api.services.document_jobs import MAX_ATTEMPTS, dispatch_document_jobs
+
+    monkeypatch.setattr(settings, "document_processing_mode", "queue")
+    monkeypatch.setattr(documents, "extract_text_from_pdf", lambda _, **_kwargs: "a" * 500)
+
+    pdf_bytes = b"%PDF-1.7\n" + b"A" * 1024 + b"\n%%EOF"
+    response = client.post(
+        "/documents/upload",
+        data={"trade": "electrical"},
+        files={"file": ("orphan.pdf", io.BytesIO(pdf_bytes), "application/pdf")},
+    )
+    assert response.status_code == 202
+    doc_id = uuid.UUID(response.json()["id"])
+
+    def explode_handler(_job):
+        raise AssertionError("An abandoned final attempt must not run again")
+
+    with SessionLocal() as session:
+        job = session.execute(select(DocumentJob).where(DocumentJob.document_id == doc_id)).scalar_one()
+        # As left behind by a worker that died after claiming the last attempt.
+        job.attempts = MAX_ATTEMPTS
+        session.commit()
+
+        stats = dispatch_document_jobs(session, explode_handler, on_give_up=documents.fail_document_job)
+        assert stats == {"failed": 1}
+
+        session.refresh(job)
+        assert job.status == DocumentJobStatusEnum.FAILED
+    assert not mock_s3.list_objects_v2(Bucket=settings.aws.s3_bucket).get("Contents")
+
+
 KNOWN_TEMPLATE_TEXT = (
     "Occupational Safety and Health Administration requires employers to summarize workplace "
     "injuries and illnesses annually. The OSHA Form 300A must be certified by a company executive "
@@ -188,7 +439,7 @@ def test_upload_known_template_bypasses_llm(monkeypatch, client, auth_context):
         session.add(template)
         session.commit()
 
-    def fake_extract_text(_: io.BytesIO) -> str:  # type: ignore[override]
+    def fake_extract_text(_: io.BytesIO, **_kwargs) -> str:  # type: ignore[override]
         return KNOWN_TEMPLATE_TEXT
 
     def explode_extract(*_args, **_kwargs):
@@ -9,6 +9,7 @@ from api.config import settings
 from api.db.session import SessionLocal
 from api.models.permits import Permit
 from api.models.training_certs import TrainingCert
+from api.services.storage import get_storage_service
 
 
 @pytest.fixture()
@@ -21,10 +22,12 @@ def mock_s3_bucket():
         s3.create_bucket(Bucket=bucket)
         previous_bucket = settings.aws.s3_bucket
         settings.aws.s3_bucket = bucket
+        get_storage_service.cache_clear()
         try:
             yield s3
         finally:
             settings.aws.s3_bucket = previous_bucket
+            get_storage_service.cache_clear()
 
 
 def test_permit_upload_saves_to_s3(client, auth_context, mock_s3_bucket):